@@ -0,0 +1,18 @@
+"""Benchmarks for the cg3dguru wrapper hot paths
+
+The benchmarks run headless against the in-memory csc stand-in found in
+fake_csc, over synthetic scenes of increasing size. Run them from the
+repository root:
+
+    python -m benchmarks
+    python -m benchmarks --sizes 1000 10000 --cases CscWrapper PyScene.get_scene_objects
+    python -m benchmarks --output results.json
+    python -m benchmarks --call-cost 0.000005
+
+Each result includes the number of csc calls the case made. --call-cost
+charges every call a synthetic latency, to estimate how the call counts
+translate into wall time inside Cascadeur.
+
+The results are printed as a table and can be written as json, so the
+timings of different commits can be compared.
+"""
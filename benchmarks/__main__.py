@@ -0,0 +1,125 @@
+"""Run the benchmarks: python -m benchmarks --help"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+from . import fake_csc
+
+
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="The number of objects in each benchmarked scene")
+    parser.add_argument('--cases', nargs='+', default=None,
+                        help="Only run the cases whose names start with one of these")
+    parser.add_argument('--repeat', type=int, default=5,
+                        help="How many times each case is timed")
+    parser.add_argument('--call-cost', type=float, default=0.0,
+                        help="Synthetic latency in seconds charged to every csc call")
+    parser.add_argument('--output', default=None,
+                        help="Write the results to this json file")
+    return parser.parse_args(args)
+
+
+
+def import_cg3dguru():
+    """Install the csc stand-in and import cg3dguru from this checkout"""
+    fake_csc.install()
+    src_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+    if src_dir not in sys.path:
+        sys.path.insert(0, src_dir)
+
+    import cg3dguru
+    return cg3dguru
+
+
+
+def select_cases(all_cases, prefixes):
+    if not prefixes:
+        return list(all_cases.values())
+
+    return [case for name, case in all_cases.items() if any(name.startswith(prefix) for prefix in prefixes)]
+
+
+
+def time_case(scene, case, repeat: int) -> dict:
+    run, ops = case.setup(scene)
+    timings = []
+    for index in range(repeat):
+        if case.cold:
+            scene.flush_cache()
+
+        #don't charge a run for the garbage of the previous one
+        gc.collect()
+        fake_csc.reset_counters()
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+
+    #every run makes the same calls, so the counts of the last one are kept
+    api_calls = fake_csc.total_calls()
+    best = min(timings)
+    return {
+        'case': case.name,
+        'ops': ops,
+        'cold': case.cold,
+        'best': best,
+        'median': statistics.median(timings),
+        'per_op': best / ops if ops else 0.0,
+        'api_calls': api_calls,
+        'api_calls_per_op': api_calls / ops if ops else 0.0,
+        'api_call_counts': fake_csc.call_counts(),
+    }
+
+
+
+def main(args=None):
+    options = parse_args(args)
+    cg3dguru = import_cg3dguru()
+    fake_csc.set_call_cost(options.call_cost)
+    from . import cases, scenes
+
+    selected_cases = select_cases(cases.CASES, options.cases)
+    results = []
+    print('{:<45} {:>8} {:>8} {:>12} {:>12} {:>12}'.format('case', 'size', 'ops', 'best (ms)', 'per op (us)', 'calls/op'))
+    for size in options.sizes:
+        scene = scenes.build(size)
+        for case in selected_cases:
+            result = time_case(scene, case, options.repeat)
+            result['size'] = size
+            results.append(result)
+            print('{:<45} {:>8} {:>8} {:>12.3f} {:>12.3f} {:>12.2f}'.format(
+                case.name, size, result['ops'], result['best'] * 1000, result['per_op'] * 1000000,
+                result['api_calls_per_op']))
+
+        scenes.release(scene)
+
+    if options.output:
+        report = {
+            'cg3dguru': cg3dguru.__version__,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': options.repeat,
+            'call_cost': options.call_cost,
+            'results': results,
+        }
+        with open(options.output, 'w') as handle:
+            json.dump(report, handle, indent=2)
+
+    return results
+
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,242 @@
+"""The benchmarked operations
+
+Each case is registered with @case and is a setup function taking the
+PyScene under test. The setup returns (run, ops): a callable performing the
+measured work and the number of operations run performs, so the timings
+can be reported per operation.
+"""
+
+import collections
+import typing
+
+from cg3dguru.datatypes import CscWrapper, PyBehaviour
+
+from . import scenes
+
+
+#The number of objects the per-object cases work through, regardless of
+#scene size. This keeps the per-operation cost comparable between sizes.
+SAMPLE_SIZE = 1000
+
+#The number of edits run by the PyScene.edit cases
+EDIT_COUNT = 1000
+
+
+Case = collections.namedtuple('Case', ['name', 'setup', 'cold'])
+CASES: typing.Dict[str, Case] = collections.OrderedDict()
+
+
+
+def case(name: str, cold: bool=False):
+    """Register a benchmark case
+
+    Args:
+        name: The name the results are reported under
+        cold: Flush the scene caches before each run, so every run pays for
+        the first lookup of the scene.
+    """
+    def decorator(setup):
+        CASES[name] = Case(name, setup, cold)
+        return setup
+
+    return decorator
+
+
+
+################
+###---Wrapping
+################
+
+@case('CscWrapper.wrap')
+def wrap_objects(scene):
+    object_ids = scene.mv.unwrap().get_objects()
+    creator = scene.mv
+
+    def run():
+        for object_id in object_ids:
+            CscWrapper.wrap(object_id, creator)
+
+    return run, len(object_ids)
+
+
+
+@case('PyBehaviour.__init__')
+def create_behaviours(scene):
+    behaviour_viewer = scene.bv.unwrap()
+    behaviour_ids = []
+    for scene_object in scenes.sample(scene, SAMPLE_SIZE):
+        behaviour_ids.extend(behaviour_viewer.get_behaviours(scene_object.unwrap()))
+
+    creator = scene.bv
+
+    def run():
+        for behaviour_id in behaviour_ids:
+            PyBehaviour(behaviour_id, creator)
+
+    return run, len(behaviour_ids)
+
+
+
+@case('PyObject.get_behaviour_by_name', cold=True)
+def get_behaviour_by_name_cold(scene):
+    objects = scenes.sample(scene, SAMPLE_SIZE)
+
+    def run():
+        for scene_object in objects:
+            scene_object.get_behaviour_by_name('Transform')
+
+    return run, len(objects)
+
+
+
+@case('PyObject.get_behaviour_by_name (warm)')
+def get_behaviour_by_name_warm(scene):
+    objects = scenes.sample(scene, SAMPLE_SIZE)
+    for scene_object in objects:
+        scene_object.get_behaviour_by_name('Transform')
+
+    def run():
+        for scene_object in objects:
+            scene_object.get_behaviour_by_name('Transform')
+
+    return run, len(objects)
+
+
+
+################
+###---Scene queries
+################
+
+@case('PyScene.get_scene_objects', cold=True)
+def get_all_objects(scene):
+    def run():
+        scene.get_scene_objects()
+
+    return run, 1
+
+
+
+@case('PyScene.get_scene_objects(names)', cold=True)
+def get_objects_by_name(scene):
+    names = [scene_object.name for scene_object in scenes.sample(scene, 10)]
+
+    def run():
+        scene.get_scene_objects(names=names)
+
+    return run, 1
+
+
+
+@case('PyScene.get_scene_objects(selected)', cold=True)
+def get_selected_objects(scene):
+    scene.select(scenes.sample(scene, 100))
+
+    def run():
+        scene.get_scene_objects(selected=True)
+
+    return run, 1
+
+
+
+@case('PyScene.get_scene_objects(of_type)', cold=True)
+def get_objects_of_type(scene):
+    def run():
+        scene.get_scene_objects(of_type='Joint')
+
+    return run, 1
+
+
+
+@case('PyScene.get_scene_objects(only_roots)', cold=True)
+def get_root_objects(scene):
+    def run():
+        scene.get_scene_objects(only_roots=True)
+
+    return run, 1
+
+
+
+################
+###---Properties
+################
+
+@case('DataProperty.get')
+def get_data(scene):
+    properties = [scene_object.Transform.local_position for scene_object in scenes.sample(scene, SAMPLE_SIZE)]
+
+    def run():
+        for data_property in properties:
+            data_property.get(0)
+
+    return run, len(properties)
+
+
+
+@case('DataProperty.set')
+def set_data(scene):
+    properties = [scene_object.Basic.visible for scene_object in scenes.sample(scene, SAMPLE_SIZE)]
+
+    def run():
+        for data_property in properties:
+            data_property.set(True)
+
+    return run, len(properties)
+
+
+
+@case('DataProperty.set (animated)')
+def set_animated_data(scene):
+    properties = [scene_object.Transform.local_position for scene_object in scenes.sample(scene, SAMPLE_SIZE)]
+
+    def run():
+        for data_property in properties:
+            data_property.set((1.0, 2.0, 3.0), frame=5)
+
+    return run, len(properties)
+
+
+
+@case('DataProperty.get (animated)')
+def get_animated_data(scene):
+    properties = [scene_object.Transform.local_position for scene_object in scenes.sample(scene, SAMPLE_SIZE)]
+    for data_property in properties:
+        data_property.set((1.0, 2.0, 3.0), frame=5)
+
+    def run():
+        for data_property in properties:
+            data_property.get(5)
+
+    return run, len(properties)
+
+
+
+################
+###---Editing
+################
+
+@case('PyScene.edit')
+def edit(scene):
+    def _noop(scene):
+        pass
+
+    def run():
+        for index in range(EDIT_COUNT):
+            scene.edit('Benchmark', _noop)
+
+    return run, EDIT_COUNT
+
+
+
+@case('PyScene.edit (nested)')
+def nested_edit(scene):
+    def _noop(scene):
+        pass
+
+    def _nested(scene):
+        for index in range(EDIT_COUNT):
+            scene.edit('Benchmark', _noop)
+
+    def run():
+        scene.edit('Benchmark', _nested)
+
+    return run, EDIT_COUNT
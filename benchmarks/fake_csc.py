@@ -0,0 +1,1183 @@
+"""In-memory stand-in for the subset of the Cascadeur ``csc`` module used by cg3dguru
+
+The stand-in keeps a whole scene in plain Python containers so the wrappers
+in cg3dguru can be exercised, benchmarked and profiled outside of Cascadeur.
+Call install() before cg3dguru is imported, e.g.:
+
+    from benchmarks import fake_csc
+    fake_csc.install()
+    import cg3dguru
+
+Every public method of the stand-in classes is routed through a cost model.
+Each call is counted per method (see call_counts()) and can be charged a
+synthetic latency (see set_call_cost()), so the number of api calls and the
+wall time an operation would cost inside Cascadeur can be estimated.
+"""
+
+import collections
+import enum
+import functools
+import itertools
+import os
+import sys
+import time
+import types
+
+
+
+GIT_COUNT = 40000
+
+_id_counter = itertools.count(1)
+_namespaces = {}
+
+_call_counts = collections.Counter()
+_default_cost = 0.0
+_method_costs = {}
+
+
+
+################
+###---Cost model
+################
+
+def set_call_cost(seconds: float = 0.0, **method_costs):
+    """Set the synthetic latency charged for each API call
+
+    Args:
+        seconds: The latency charged to every call without a specific cost
+        method_costs: Per method latency, keyed as Class__method. For example
+        set_call_cost(0.000002, DataViewer__get_data_value=0.00001)
+    """
+    global _default_cost
+    _default_cost = seconds
+    _method_costs.clear()
+    for key, value in method_costs.items():
+        _method_costs[key.replace('__', '.')] = value
+
+
+
+def call_counts() -> dict:
+    """Returns a copy of the per method call counts"""
+    return dict(_call_counts)
+
+
+
+def total_calls() -> int:
+    """Returns the number of API calls made since the last reset"""
+    return sum(_call_counts.values())
+
+
+
+def reset_counters():
+    _call_counts.clear()
+
+
+
+def _spend(seconds):
+    #time.sleep() is far too coarse for microsecond costs, so spin instead.
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+
+def _api_method(label, func):
+    @functools.wraps(func)
+    def _charged(*args, **kwargs):
+        _call_counts[label] += 1
+        cost = _method_costs.get(label, _default_cost)
+        if cost:
+            _spend(cost)
+
+        return func(*args, **kwargs)
+
+    return _charged
+
+
+
+def _api(namespace):
+    """Class decorator placing the class in csc.<namespace> and charging its calls"""
+    def decorator(cls):
+        cls.__module__ = 'csc.' + namespace if namespace else 'csc'
+        for name, value in list(vars(cls).items()):
+            if name.startswith('_') or not isinstance(value, types.FunctionType):
+                continue
+
+            setattr(cls, name, _api_method('{}.{}'.format(cls.__name__, name), value))
+
+        _namespaces.setdefault(namespace, []).append(cls)
+        return cls
+
+    return decorator
+
+
+
+################
+###---Ids
+################
+
+@_api('')
+class Guid(object):
+    def __init__(self, value=None):
+        if value is None:
+            value = next(_id_counter)
+
+        self._value = value
+
+
+    def __eq__(self, other):
+        if isinstance(other, Guid):
+            return self._value == other._value
+
+        return NotImplemented
+
+
+    def __hash__(self):
+        return hash(self._value)
+
+
+    def __repr__(self):
+        return '{}({})'.format(self.__class__.__name__, self._value)
+
+
+    @classmethod
+    def null(cls):
+        return cls(0)
+
+
+    def is_null(self):
+        return self._value == 0
+
+
+    def to_string(self):
+        return '{:032x}'.format(self._value)
+
+
+
+@_api('model')
+class ObjectId(Guid):
+    pass
+
+
+
+@_api('model')
+class BehaviourId(Guid):
+    pass
+
+
+
+@_api('model')
+class DataId(Guid):
+    pass
+
+
+
+@_api('model')
+class SettingId(Guid):
+    pass
+
+
+
+@_api('domain')
+class AssetId(Guid):
+    pass
+
+
+
+class DataMode(enum.Enum):
+    Static = 0
+    Animation = 1
+
+
+
+class SettingMode(enum.Enum):
+    Static = 0
+    Animation = 1
+
+
+DataMode.__module__ = SettingMode.__module__ = 'csc.model'
+
+
+
+@_api('model')
+class Data(object):
+    def __init__(self, record):
+        self._record = record
+
+
+    @property
+    def id(self):
+        return self._record.id
+
+
+    @property
+    def name(self):
+        return self._record.name
+
+
+    @property
+    def mode(self):
+        return self._record.mode
+
+
+
+@_api('model')
+class Setting(Data):
+    pass
+
+
+
+################
+###---Scene storage
+################
+
+class _ObjectRecord(object):
+    def __init__(self, object_id, name, type_name):
+        self.id = object_id
+        self.name = name
+        self.type_name = type_name
+        self.behaviours = []
+
+
+
+class _BehaviourRecord(object):
+    def __init__(self, behaviour_id, name, owner):
+        self.id = behaviour_id
+        self.name = name
+        self.owner = owner
+        self.hidden = False
+        #property name -> [kind, value]
+        self.properties = {}
+
+
+
+class _DataRecord(object):
+    def __init__(self, data_id, name, mode, value):
+        self.id = data_id
+        self.name = name
+        self.mode = mode
+        self.value = value
+        self.keys = {}
+
+
+    def get(self, frame=None):
+        if frame is None or not self.keys:
+            return self.value
+
+        return self.keys.get(frame, self.value)
+
+
+    def set(self, value, frame=None):
+        if frame is None or self.mode.value == 0:
+            self.value = value
+        else:
+            self.keys[frame] = value
+
+
+#The properties each behaviour type exposes: name -> (kind, default)
+BEHAVIOUR_SCHEMAS = {
+    'Basic': {
+        'parent': ('object', None),
+        'visible': ('data', True),
+        'lock': ('data', False),
+    },
+    'Transform': {
+        'local_position': ('data', (0.0, 0.0, 0.0)),
+        'local_rotation': ('data', (0.0, 0.0, 0.0, 1.0)),
+        'local_scale': ('data', (1.0, 1.0, 1.0)),
+        'global_position': ('data', (0.0, 0.0, 0.0)),
+    },
+    'Joint': {
+        'length': ('data', 1.0),
+        'rig_points': ('object_range', None),
+    },
+    'Mesh': {
+        'vertices': ('data_range', None),
+        'material': ('setting', 0),
+    },
+    'Dynamic': {
+        'behaviourName': ('string', ''),
+        'targets': ('reference_range', None),
+        'source': ('reference', None),
+    },
+}
+
+
+
+class _Store(object):
+    def __init__(self):
+        self.objects = collections.OrderedDict()
+        self.behaviours = {}
+        self.data = {}
+        self.settings = {}
+        self.selection = []
+        self.current_frame = 0
+        self.animation_size = 100
+        self.undo_stack = []
+
+
+    def add_object(self, name, type_name='Object', behaviours=('Basic', 'Transform')):
+        record = _ObjectRecord(ObjectId(), name, type_name)
+        self.objects[record.id] = record
+        for beh_name in behaviours:
+            self.add_behaviour(record.id, beh_name)
+
+        return record.id
+
+
+    def add_behaviour(self, object_id, name):
+        record = _BehaviourRecord(BehaviourId(), name, object_id)
+        self.behaviours[record.id] = record
+        self.objects[object_id].behaviours.append(record.id)
+        for prop_name, (kind, default) in BEHAVIOUR_SCHEMAS.get(name, {}).items():
+            if kind == 'data':
+                mode = DataMode.Animation if isinstance(default, tuple) else DataMode.Static
+                value = self.add_data(prop_name, mode, default).id
+            elif kind == 'setting':
+                value = self.add_setting(prop_name, SettingMode.Static, default).id
+            elif kind == 'object':
+                value = ObjectId.null()
+            elif kind == 'reference':
+                value = BehaviourId.null()
+            elif kind.endswith('_range'):
+                value = []
+            else:
+                value = default
+
+            record.properties[prop_name] = [kind, value]
+
+        return record.id
+
+
+    def add_data(self, name, mode, value, data_id=None):
+        record = _DataRecord(data_id or DataId(), name, mode, value)
+        self.data[record.id] = record
+        return record
+
+
+    def add_setting(self, name, mode, value, setting_id=None):
+        record = _DataRecord(setting_id or SettingId(), name, mode, value)
+        self.settings[record.id] = record
+        return record
+
+
+    def property(self, behaviour_id, name, kind):
+        prop = self.behaviours[behaviour_id].properties.get(name)
+        if prop is None or prop[0] != kind:
+            raise TypeError("{} isn't a {} property".format(name, kind))
+
+        return prop
+
+
+
+################
+###---Viewers
+################
+
+@_api('model')
+class ModelViewer(object):
+    def __init__(self, store):
+        self._store = store
+
+
+    def get_objects(self, name=None):
+        if name is None:
+            return list(self._store.objects)
+
+        return [record.id for record in self._store.objects.values() if record.name == name]
+
+
+    def get_object_name(self, object_id):
+        return self._store.objects[object_id].name
+
+
+    def get_object_type_name(self, object_id):
+        return self._store.objects[object_id].type_name
+
+
+
+@_api('model')
+class BehaviourViewer(object):
+    def __init__(self, store):
+        self._store = store
+
+
+    def get_behaviours(self, object_id):
+        return list(self._store.objects[object_id].behaviours)
+
+
+    def get_behaviour_name(self, behaviour_id):
+        return self._store.behaviours[behaviour_id].name
+
+
+    def get_behaviour_owner(self, behaviour_id):
+        return self._store.behaviours[behaviour_id].owner
+
+
+    def get_behaviour_property_names(self, behaviour_id):
+        return list(self._store.behaviours[behaviour_id].properties)
+
+
+    def is_hidden(self, behaviour_id):
+        return self._store.behaviours[behaviour_id].hidden
+
+
+    def get_behaviour_data(self, behaviour_id, name):
+        return self._store.property(behaviour_id, name, 'data')[1]
+
+
+    def get_behaviour_data_range(self, behaviour_id, name):
+        return list(self._store.property(behaviour_id, name, 'data_range')[1])
+
+
+    def get_behaviour_setting(self, behaviour_id, name):
+        return self._store.property(behaviour_id, name, 'setting')[1]
+
+
+    def get_behaviour_settings_range(self, behaviour_id, name):
+        return list(self._store.property(behaviour_id, name, 'setting_range')[1])
+
+
+    def get_behaviour_object(self, behaviour_id, name):
+        return self._store.property(behaviour_id, name, 'object')[1]
+
+
+    def get_behaviour_objects_range(self, behaviour_id, name):
+        return list(self._store.property(behaviour_id, name, 'object_range')[1])
+
+
+    def get_behaviour_reference(self, behaviour_id, name):
+        return self._store.property(behaviour_id, name, 'reference')[1]
+
+
+    def get_behaviour_reference_range(self, behaviour_id, name):
+        return list(self._store.property(behaviour_id, name, 'reference_range')[1])
+
+
+    def get_behaviour_string(self, behaviour_id, name):
+        return self._store.property(behaviour_id, name, 'string')[1]
+
+
+
+@_api('model')
+class DataViewer(object):
+    def __init__(self, store):
+        self._store = store
+
+
+    def get_data(self, data_id):
+        return Data(self._store.data[data_id])
+
+
+    def get_data_value(self, data_id, frame=None):
+        return self._store.data[data_id].get(frame)
+
+
+    def get_setting(self, setting_id):
+        return Setting(self._store.settings[setting_id])
+
+
+    def get_setting_value(self, setting_id, frame=None):
+        return self._store.settings[setting_id].get(frame)
+
+
+    def get_behaviour_default_data_value(self, behaviour_id, name):
+        behaviour = self._store.behaviours[behaviour_id]
+        return BEHAVIOUR_SCHEMAS[behaviour.name][name][1]
+
+
+    def get_animation_size(self):
+        return self._store.animation_size
+
+
+
+@_api('layers')
+class Viewer(object):
+    def __init__(self, store):
+        self._store = store
+
+
+
+################
+###---Editors
+################
+
+@_api('model')
+class ModelEditor(object):
+    def __init__(self, store):
+        self._store = store
+
+
+    def set_object_name(self, object_id, name):
+        self._store.objects[object_id].name = name
+
+
+    def behaviour_editor(self):
+        return BehaviourEditor(self._store)
+
+
+    def data_editor(self):
+        return DataEditor(self._store)
+
+
+    def layers_editor(self):
+        return LayersEditor(self._store)
+
+
+    def layers_selector(self):
+        return LayersSelector(self._store)
+
+
+
+@_api('model')
+class BehaviourEditor(object):
+    def __init__(self, store):
+        self._store = store
+
+
+    def add_behaviour(self, object_id, name):
+        return self._store.add_behaviour(object_id, name)
+
+
+    def delete_behaviour(self, behaviour_id):
+        record = self._store.behaviours.pop(behaviour_id)
+        self._store.objects[record.owner].behaviours.remove(behaviour_id)
+        return True
+
+
+    def hide_behaviour(self, behaviour_id, hidden):
+        self._store.behaviours[behaviour_id].hidden = hidden
+        return True
+
+
+    def _set(self, behaviour_id, name, kind, value):
+        self._store.property(behaviour_id, name, kind)[1] = value
+        return True
+
+
+    def _add(self, behaviour_id, name, kind, value):
+        self._store.property(behaviour_id, name, kind)[1].append(value)
+        return True
+
+
+    def _erase(self, behaviour_id, name, kind, value):
+        self._store.property(behaviour_id, name, kind)[1].remove(value)
+        return True
+
+
+    def set_behaviour_data(self, behaviour_id, name, data_id):
+        return self._set(behaviour_id, name, 'data', data_id)
+
+
+    def set_behaviour_data_to_range(self, behaviour_id, name, data_ids):
+        return self._set(behaviour_id, name, 'data_range', list(data_ids))
+
+
+    def set_behaviour_setting(self, behaviour_id, name, setting_id):
+        return self._set(behaviour_id, name, 'setting', setting_id)
+
+
+    def set_behaviour_settings_to_range(self, behaviour_id, name, setting_ids):
+        return self._set(behaviour_id, name, 'setting_range', list(setting_ids))
+
+
+    def set_behaviour_model_object(self, behaviour_id, name, object_id):
+        return self._set(behaviour_id, name, 'object', object_id)
+
+
+    def set_behaviour_model_objects_to_range(self, behaviour_id, name, object_ids):
+        return self._set(behaviour_id, name, 'object_range', list(object_ids))
+
+
+    def set_behaviour_reference(self, behaviour_id, name, reference_id):
+        return self._set(behaviour_id, name, 'reference', reference_id)
+
+
+    def set_behaviour_references_to_range(self, behaviour_id, name, reference_ids):
+        return self._set(behaviour_id, name, 'reference_range', list(reference_ids))
+
+
+    def set_behaviour_string(self, behaviour_id, name, value):
+        return self._set(behaviour_id, name, 'string', value)
+
+
+    def set_behaviour_field_value(self, behaviour_id, name, value):
+        return self._set(behaviour_id, name, 'string', value)
+
+
+    def add_behaviour_data_to_range(self, behaviour_id, name, data_id):
+        return self._add(behaviour_id, name, 'data_range', data_id)
+
+
+    def add_behaviour_setting_to_range(self, behaviour_id, name, setting_id):
+        return self._add(behaviour_id, name, 'setting_range', setting_id)
+
+
+    def add_behaviour_model_object_to_range(self, behaviour_id, name, object_id):
+        return self._add(behaviour_id, name, 'object_range', object_id)
+
+
+    def add_behaviour_reference_to_range(self, behaviour_id, name, reference_id):
+        return self._add(behaviour_id, name, 'reference_range', reference_id)
+
+
+    def erase_behaviour_data_from_range(self, behaviour_id, name, data_id):
+        return self._erase(behaviour_id, name, 'data_range', data_id)
+
+
+    def erase_behaviour_setting_from_range(self, behaviour_id, name, setting_id):
+        return self._erase(behaviour_id, name, 'setting_range', setting_id)
+
+
+    def erase_behaviour_model_object_from_range(self, behaviour_id, name, object_id):
+        return self._erase(behaviour_id, name, 'object_range', object_id)
+
+
+    def erase_behaviour_reference_from_range(self, behaviour_id, name, reference_id):
+        return self._erase(behaviour_id, name, 'reference_range', reference_id)
+
+
+
+@_api('model')
+class DataEditor(object):
+    def __init__(self, store):
+        self._store = store
+
+
+    def add_data(self, object_id, name, mode, value, data_id=None):
+        return Data(self._store.add_data(name, mode, value, data_id))
+
+
+    def add_setting(self, object_id, name, mode, value, setting_id=None):
+        return Setting(self._store.add_setting(name, mode, value, setting_id))
+
+
+    def set_data_value(self, data_id, *args):
+        _set_value(self._store.data[data_id], args)
+        return True
+
+
+    def set_setting_value(self, setting_id, *args):
+        _set_value(self._store.settings[setting_id], args)
+        return True
+
+
+
+def _set_value(record, args):
+    if len(args) == 1:
+        record.set(args[0])
+    elif isinstance(args[0], int):
+        record.set(args[1], args[0])
+    else:
+        for frame in args[0]:
+            record.set(args[1], frame)
+
+
+
+@_api('layers')
+class Editor(object):
+    def __init__(self, store):
+        self._store = store
+
+
+
+LayersEditor = Editor
+
+
+
+@_api('layers')
+class LayersSelector(object):
+    def __init__(self, store):
+        self._store = store
+
+
+    def all_included_layer_ids(self):
+        return [Guid(1)]
+
+
+    def set_full_selection_by_parts(self, layer_ids, start, end):
+        self._store.frame_selection = (start, end)
+
+
+
+################
+###---Update graph
+################
+
+@_api('update')
+class Object(object):
+    def __init__(self, store, object_id):
+        self._store = store
+        self._object_id = object_id
+
+
+    def object_id(self):
+        return self._object_id
+
+
+    def root_group(self):
+        return UpdateGroup(self._store, '')
+
+
+    def name(self):
+        return self._store.objects[self._object_id].name
+
+
+
+@_api('update')
+class UpdateGroup(object):
+    def __init__(self, store, name):
+        self._store = store
+        self._name = name
+        self._groups = store.__dict__.setdefault('update_groups', {})
+
+
+    def name(self):
+        return self._name
+
+
+    def create_object(self, name):
+        return Object(self._store, self._store.add_object(name))
+
+
+    def has_node(self, name):
+        return name in self._groups
+
+
+    def nodes(self):
+        return [UpdateGroup(self._store, name) for name in self._groups]
+
+
+    def create_sub_update_group(self, name):
+        self._groups[name] = []
+        return UpdateGroup(self._store, name)
+
+
+    def create_regular_data(self, name, value, mode):
+        record = self._store.add_data(name, mode, value)
+        self._groups.setdefault(self._name, []).append(record.id)
+        return RegularData(record.id)
+
+
+
+@_api('update')
+class RegularData(object):
+    def __init__(self, data_id):
+        self._data_id = data_id
+
+
+    def data_id(self):
+        return self._data_id
+
+
+
+@_api('update')
+class ObjectGroup(UpdateGroup):
+    pass
+
+
+
+@_api('update')
+class Update(object):
+    def __init__(self, store):
+        self._store = store
+
+
+    def root(self):
+        return UpdateGroup(self._store, '')
+
+
+    def get_node_by_id(self, object_id):
+        return Object(self._store, object_id)
+
+
+
+################
+###---Domain
+################
+
+@_api('domain')
+class Selection(object):
+    def __init__(self, store):
+        self._store = store
+
+
+    @property
+    def ids(self):
+        return list(self._store.selection)
+
+
+
+@_api('domain')
+class Selector(object):
+    def __init__(self, store):
+        self._store = store
+
+
+    def selected(self):
+        return Selection(self._store)
+
+
+
+@_api('domain')
+class SelectionChanger(object):
+    def __init__(self, store):
+        self._store = store
+
+
+    def select(self, object_ids, *args, **kwargs):
+        self._store.selection = list(object_ids)
+
+
+
+@_api('domain')
+class LayersSelectionChanger(object):
+    def __init__(self, store):
+        self._store = store
+
+
+    def set_full_selection_by_parts(self, layer_ids, start, end):
+        self._store.frame_selection = (start, end)
+
+
+
+@_api('domain')
+class Session(object):
+    def __init__(self, store):
+        self._store = store
+
+
+    def take_selector(self):
+        return SelectionChanger(self._store)
+
+
+    def take_layers_selector(self):
+        return LayersSelectionChanger(self._store)
+
+
+
+@_api('domain')
+class SceneUpdater(object):
+    def __init__(self, store):
+        self._store = store
+        self.update_count = 0
+
+
+    def generate_update(self):
+        self.update_count += 1
+        self._store.__dict__['generated_updates'] = self._store.__dict__.get('generated_updates', 0) + 1
+
+
+
+@_api('domain')
+class Scene(object):
+    def __init__(self, store):
+        self._store = store
+        self._model_viewer = ModelViewer(store)
+        self._behaviour_viewer = BehaviourViewer(store)
+        self._data_viewer = DataViewer(store)
+        self._layers_viewer = Viewer(store)
+
+
+    @property
+    def store(self):
+        return self._store
+
+
+    def model_viewer(self):
+        return self._model_viewer
+
+
+    def behaviour_viewer(self):
+        return self._behaviour_viewer
+
+
+    def data_viewer(self):
+        return self._data_viewer
+
+
+    def layers_viewer(self):
+        return self._layers_viewer
+
+
+    def selector(self):
+        return Selector(self._store)
+
+
+    def get_current_frame(self, clamp_animation=True):
+        return self._store.current_frame
+
+
+    def set_current_frame(self, frame):
+        self._store.current_frame = frame
+
+
+    def warning(self, message):
+        pass
+
+
+    def error(self, message):
+        pass
+
+
+    def modify_update_with_session(self, title, func):
+        store = self._store
+        func(ModelEditor(store), Update(store), SceneUpdater(store), Session(store))
+        store.undo_stack.append(title)
+
+
+    def modify_update(self, title, func):
+        store = self._store
+        func(ModelEditor(store), Update(store), SceneUpdater(store))
+        store.undo_stack.append(title)
+
+
+    def modify(self, title, func):
+        store = self._store
+        func(ModelEditor(store))
+        store.undo_stack.append(title)
+
+
+
+DomainScene = Scene
+
+
+
+################
+###---Application
+################
+
+@_api('view')
+class ViewScene(object):
+    def __init__(self):
+        self._domain_scene = DomainScene(_Store())
+
+
+    def domain_scene(self):
+        return self._domain_scene
+
+
+ViewScene.__name__ = ViewScene.__qualname__ = 'Scene'
+
+
+
+@_api('view')
+class SceneManager(object):
+    def __init__(self):
+        self._scenes = []
+        self._current = None
+
+
+    def create_application_scene(self):
+        scene = ViewScene()
+        self._scenes.append(scene)
+        return scene
+
+
+    def current_scene(self):
+        if self._current is None:
+            self._current = self.create_application_scene()
+
+        return self._current
+
+
+    def set_current_scene(self, scene):
+        self._current = scene
+
+
+    def close_scene(self, scene):
+        self._scenes.remove(scene)
+        if self._current is scene:
+            self._current = None
+
+
+
+@_api('fbx')
+class FbxLoader(object):
+    """Writes placeholder files on export and records the imports
+
+    Importing a scene or model adds an object named after the file.
+    """
+
+    def __init__(self, scene):
+        self._scene = scene
+        self.imported = []
+
+
+    def _write(self, file_path, kind):
+        store = self._scene.domain_scene().store
+        with open(file_path, 'w') as handle:
+            handle.write('; FBX 7.4.0 project file\n; placeholder {} export of {} objects\n'.format(kind, len(store.objects)))
+
+
+    def _read(self, file_path, kind):
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(file_path)
+
+        self.imported.append((kind, file_path))
+        if kind in ('scene', 'model'):
+            store = self._scene.domain_scene().store
+            store.add_object(os.path.splitext(os.path.basename(file_path))[0])
+
+
+    def export_all_objects(self, file_path):
+        self._write(file_path, 'scene')
+
+
+    def export_model(self, file_path):
+        self._write(file_path, 'model')
+
+
+    def export_scene_selected_objects(self, file_path):
+        self._write(file_path, 'selected')
+
+
+    def export_joints(self, file_path):
+        self._write(file_path, 'animation')
+
+
+    def import_scene(self, file_path):
+        self._read(file_path, 'scene')
+
+
+    def import_model(self, file_path):
+        self._read(file_path, 'model')
+
+
+    def import_animation(self, file_path):
+        self._read(file_path, 'animation')
+
+
+    def import_animation_to_selected_objects(self, file_path):
+        self._read(file_path, 'selected')
+
+
+    def import_animation_to_selected_frames(self, file_path):
+        self._read(file_path, 'frames')
+
+
+
+@_api('app')
+class FbxSceneLoader(object):
+    def get_fbx_loader(self, scene):
+        return FbxLoader(scene)
+
+
+
+@_api('app')
+class ToolsManager(object):
+    def get_tool(self, name):
+        if name != 'FbxSceneLoader':
+            raise KeyError(name)
+
+        return FbxSceneLoader()
+
+
+
+@_api('app')
+class Application(object):
+    def __init__(self):
+        self._scene_manager = SceneManager()
+        self._tools_manager = ToolsManager()
+
+
+    def get_scene_manager(self):
+        return self._scene_manager
+
+
+    def get_tools_manager(self):
+        return self._tools_manager
+
+
+
+_application = None
+
+
+
+def get_application():
+    global _application
+    if _application is None:
+        _application = Application()
+
+    return _application
+
+
+
+@_api('')
+class SystemVariables(object):
+    @staticmethod
+    def git_count():
+        return str(GIT_COUNT)
+
+
+
+################
+###---Installation
+################
+
+def build_module() -> types.ModuleType:
+    """Assemble the stand-in as a module tree shaped like csc"""
+    csc = types.ModuleType('csc')
+    csc.__doc__ = __doc__
+    sub = {}
+    for name in ('model', 'view', 'domain', 'update', 'layers', 'fbx', 'app', 'math'):
+        module = types.ModuleType('csc.' + name)
+        setattr(csc, name, module)
+        sub['csc.' + name] = module
+
+    for cls in _namespaces.get(''):
+        setattr(csc, cls.__name__, cls)
+
+    for namespace, classes in _namespaces.items():
+        if not namespace:
+            continue
+        for cls in classes:
+            setattr(sub['csc.' + namespace], cls.__name__, cls)
+
+    csc.model.DataMode = DataMode
+    csc.model.SettingMode = SettingMode
+    csc.layers.Editor = Editor
+    csc.app.get_application = get_application
+
+    return csc, sub
+
+
+
+def install():
+    """Register the stand-in as the csc module"""
+    if 'csc' in sys.modules:
+        return sys.modules['csc']
+
+    csc, sub = build_module()
+    sys.modules['csc'] = csc
+    sys.modules.update(sub)
+    return csc
+
+
+
+def build_scene(object_count: int, store: _Store = None, joints_ratio=0.5, dynamic_ratio=0.1) -> _Store:
+    """Fill a store with a synthetic hierarchy of objects"""
+    if store is None:
+        store = get_application().get_scene_manager().current_scene().domain_scene().store
+
+    parents = []
+    for index in range(object_count):
+        if index % 10 < joints_ratio * 10:
+            type_name = 'Joint'
+            behaviours = ('Basic', 'Transform', 'Joint')
+        else:
+            type_name = 'Mesh'
+            behaviours = ('Basic', 'Transform', 'Mesh')
+
+        object_id = store.add_object('{}_{}'.format(type_name, index), type_name, behaviours)
+        record = store.objects[object_id]
+        if parents and index % 20:
+            basic = store.behaviours[record.behaviours[0]]
+            basic.properties['parent'][1] = parents[(index * 7) % len(parents)]
+        if index % 5 == 0:
+            parents.append(object_id)
+        if index % int(1 / dynamic_ratio) == 0:
+            dyn = store.add_behaviour(object_id, 'Dynamic')
+            store.behaviours[dyn].properties['behaviourName'][1] = 'Dyn{}'.format(index % 3)
+
+    return store
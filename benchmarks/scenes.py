@@ -0,0 +1,37 @@
+"""Synthetic scenes for the benchmarks"""
+
+import csc
+
+import cg3dguru
+
+from . import fake_csc
+
+
+
+def build(object_count: int) -> cg3dguru.datatypes.PyScene:
+    """Create a new current scene holding object_count objects
+
+    Half of the objects are Joints and half Meshes, every 5th object is a
+    parent, every 20th a root and every 10th has a Dynamic behaviour.
+    """
+    scene_manager = csc.app.get_application().get_scene_manager()
+    application_scene = scene_manager.create_application_scene()
+    scene_manager.set_current_scene(application_scene)
+    fake_csc.build_scene(object_count, application_scene.domain_scene().store)
+
+    return cg3dguru.get_current_scene()
+
+
+
+def release(scene: cg3dguru.datatypes.PyScene):
+    """Close the scene, so large scenes don't pile up between sizes"""
+    cg3dguru.close_scene(scene)
+
+
+
+def sample(scene: cg3dguru.datatypes.PyScene, count: int) -> list:
+    """Returns up to count objects spread evenly across the scene"""
+    objects = scene.get_scene_objects()
+    step = max(1, len(objects) // count)
+
+    return objects[::step][:count]
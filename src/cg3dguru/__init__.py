@@ -1,5 +1,6 @@
 from .general import *
 from . import datatypes
+from . import instrumentation
 
 __author__ = "Nathaniel Albright"
 __email__ = "developer@3dcg.guru"
@@ -2,11 +2,30 @@ from __future__ import annotations #used so I don't have to forward declare clas
 
 # https://sphinxcontrib-napoleon.readthedocs.io/en/latest/example_google.html
 
+import array
+import bisect
+import collections
+import contextlib
+import itertools
+import json
+import os
+import struct
+import sys
 from enum import Enum, Flag, auto
+import functools
 import typing
+import weakref
+import zipfile
 
 import csc
 
+from .. import instrumentation
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 _GIT_COUNT = int(csc.SystemVariables.git_count())
 
 
@@ -99,6 +118,10 @@ class PropertyError(Exception):
 
 ERROR_ON_UNKNOWN_PROPS = False
 
+#When True, PyBehaviour only probes the type of a property the first time the
+#property is accessed, instead of probing every property on creation.
+LAZY_PROPERTY_TYPES = True
+
 #################
 ####---Enums---
 #################
@@ -114,6 +137,126 @@ class PropertyType(Flag):
     OBJECT = auto()
     OBJECT_RANGE = OBJECT | RANGE
     BEH_STRING = auto()
+    
+    
+    
+class _AttributeKind(Enum):
+    """How CscWrapper.__getattr__ treats an attribute of the wrapped class"""
+    MISSING = auto()
+    METHOD = auto()
+    PROPERTY = auto()
+
+
+
+#################
+####---Helpers---
+#################
+def _get_components(value) -> tuple:
+    """Returns the numeric components of a data value as a tuple"""
+    if isinstance(value, (int, float)):
+        return (value,)
+    
+    return tuple(value)
+
+
+
+def _to_frame_array(values: typing.Iterator, frame_count: int):
+    """Pack per frame values into one contiguous (frames, components) array
+    
+    Returns:
+        numpy.ndarray: When numpy is available
+        array.array: The values flattened row by row, when numpy is missing
+    """
+    first = next(values, None)
+    if first is None:
+        return numpy.empty((0, 0)) if numpy is not None else array.array('d')
+    
+    if numpy is None:
+        result = array.array('d', _get_components(first))
+        for value in values:
+            result.extend(_get_components(value))
+            
+        return result
+    
+    result = numpy.empty((frame_count, len(_get_components(first))), dtype=numpy.float64)
+    result[0] = first
+    for row, value in enumerate(values, 1):
+        result[row] = value
+        
+    return result
+
+
+
+def _read_frame_array(read_value: typing.Callable, item_id, frames: typing.Sequence[int]):
+    """Read an animated value on each frame into one _to_frame_array() result"""
+    return _to_frame_array((read_value(item_id, frame) for frame in frames), len(frames))
+
+
+
+def _check_frame_array(rows, frame_count: int, components: int):
+    """Make sure a _to_frame_array() result holds frame_count rows of components float64s
+    
+    raises:
+        ValueError: If the shape or dtype of the rows is different
+    """
+    if numpy is not None and isinstance(rows, numpy.ndarray):
+        valid = rows.shape == (frame_count, components) and rows.dtype == numpy.float64
+    else:
+        valid = rows.typecode == 'd' and len(rows) == frame_count * components
+        
+    if not valid:
+        raise ValueError("Expected {} frames of {} float64 components".format(frame_count, components))
+
+
+
+def _npy_header(descr: str, shape: tuple) -> bytes:
+    """Returns the header of a version 1.0 .npy file holding a C ordered array"""
+    header = "{{'descr': '{}', 'fortran_order': False, 'shape': {}, }}".format(descr, repr(tuple(shape)))
+    #the magic, version and length take 10 bytes, the whole header is padded
+    #to a multiple of 64 and ends with a newline.
+    padding = 64 - (10 + len(header) + 1) % 64
+    header = header + ' ' * (padding % 64) + '\n'
+    
+    return b'\x93NUMPY\x01\x00' + struct.pack('<H', len(header)) + header.encode('latin1')
+
+
+
+def _to_little_endian_bytes(rows) -> bytes:
+    """Returns the float64 values of a _to_frame_array() result as little endian bytes"""
+    if numpy is not None and isinstance(rows, numpy.ndarray):
+        return numpy.ascontiguousarray(rows, dtype='<f8').tobytes()
+    
+    if sys.byteorder != 'little':
+        rows = array.array('d', rows)
+        rows.byteswap()
+        
+    return rows.tobytes()
+
+
+
+def _to_rows(values: array.array, frame_count: int) -> list:
+    """Split the flat array.array made by _to_frame_array() back into rows
+    
+    raises:
+        ValueError: If the values can't be split into frame_count equal rows
+    """
+    if not frame_count or len(values) % frame_count:
+        raise ValueError("{} values can't be split into {} frames".format(len(values), frame_count))
+    
+    width = len(values) // frame_count
+    if width == 1:
+        return list(values)
+    
+    return [tuple(values[start:start + width]) for start in range(0, len(values), width)]
+
+
+
+def _from_components(value):
+    """Returns a single component row as a scalar, other values unchanged"""
+    if isinstance(value, (int, float)) or len(value) != 1:
+        return value
+    
+    return value[0]
 
 
 
@@ -123,6 +266,15 @@ class PropertyType(Flag):
 class CscWrapper(object):
     _class_wrappers = None
     
+    #(wrapped class, attribute name) -> _AttributeKind
+    _attribute_kinds = {}
+    
+    #class -> tuple, see _get_wrap_dispatch()
+    _wrap_dispatch = {}
+    
+    #(wrapped class, method name) -> function, see _get_method_dispatch()
+    _method_dispatch = {}
+    
     def __init__(self, data, creator, *args, **kwargs):
         super().__init__(*args, **kwargs)
         
@@ -131,6 +283,10 @@ class CscWrapper(object):
         
         self.__data = data
         self.__creator = creator
+        #names of the bound callables __getattr__ stored on the instance and
+        #the class of the data they were made for
+        self.__bound_names = None
+        self.__bound_class = None
 
          
     def __repr__(self):
@@ -157,45 +313,115 @@ class CscWrapper(object):
     
     
     def __getattr__(self, attr):
-        if hasattr(self.__data, attr):            
-            def func_wrapper(*args, **kwargs):
-                args = self.unwrap_list(args)
-                CscWrapper.unwrap_dict(kwargs)
-                
-                func = getattr(self.__data, attr)
-                result = func(*args, **kwargs)
-
-                return self._wrap_result(result)
-                
-            if not callable(getattr(self.__data.__class__, attr)):
-                #This must be a property, so let's return the wrapped results
-                return self._wrap_result(getattr(self.__data, attr))
+        data_class = self.__data.__class__
+        kind = CscWrapper._attribute_kinds.get((data_class, attr))
+        if kind is None:
+            kind = CscWrapper._get_attribute_kind(data_class, attr)
+            CscWrapper._attribute_kinds[(data_class, attr)] = kind
+            
+        if kind is _AttributeKind.METHOD:
+            #store a callable on the instance, so later lookups of the same
+            #attribute never reach __getattr__ again. It only holds a weak
+            #reference to the wrapper, so the two don't form a cycle.
+            dispatch = CscWrapper._get_method_dispatch(data_class, attr)
+            self.__dict__[attr] = functools.partial(dispatch, weakref.ref(self))
+            if self.__bound_names is None:
+                self.__bound_names = [attr]
+                self.__bound_class = data_class
             else:
-                return func_wrapper
+                self.__bound_names.append(attr)
+                
+            #the first lookup is often made on a temporary wrapper, like
+            #scene.session.take_selector().select, so it's bound strongly.
+            return functools.partial(dispatch, lambda: self)
+        
+        elif kind is _AttributeKind.PROPERTY:
+            if instrumentation.ENABLED:
+                return self._wrap_result(instrumentation.call(
+                    '{}.{}'.format(data_class.__name__, attr), getattr, self.__data, attr))
+            
+            return self._wrap_result(getattr(self.__data, attr))
         
         raise AttributeError(attr)
     
+    
+    @staticmethod
+    def _get_attribute_kind(data_class, attr) -> _AttributeKind:
+        try:
+            class_attr = getattr(data_class, attr)
+        except AttributeError:
+            return _AttributeKind.MISSING
+        
+        if callable(class_attr):
+            return _AttributeKind.METHOD
+        
+        #This must be a property, so the value is read on every access
+        return _AttributeKind.PROPERTY
+    
+    
+    @staticmethod
+    def _get_method_dispatch(data_class, attr) -> typing.Callable:
+        """Returns a function(wrapper_ref, *args, **kwargs) calling the attr method
+        
+        wrapper_ref is a weakref.ref to the wrapper, or any callable returning
+        the wrapper. The function unwraps the
+        args, calls attr on the wrapper's data and wraps the result. One
+        function is made per (class, method name) and shared by every wrapper.
+        """
+        func_wrapper = CscWrapper._method_dispatch.get((data_class, attr))
+        if func_wrapper is not None:
+            return func_wrapper
+        
+        call_name = '{}.{}'.format(data_class.__name__, attr)
+        def func_wrapper(wrapper_ref, *args, **kwargs):
+            self = wrapper_ref()
+            if self is None:
+                raise ReferenceError("{} was called after its wrapper was deleted, keep a reference "
+                                     "to the wrapper while using its methods".format(call_name))
+            if args:
+                args = CscWrapper.unwrap_list(args)
+            if kwargs:
+                CscWrapper.unwrap_dict(kwargs)
+            
+            if instrumentation.ENABLED:
+                result = instrumentation.call(call_name, getattr(self.__data, attr), *args, **kwargs)
+            else:
+                result = getattr(self.__data, attr)(*args, **kwargs)
+                
+            return self._wrap_result(result)
+        
+        CscWrapper._method_dispatch[(data_class, attr)] = func_wrapper
+        return func_wrapper
+    
                 
     @staticmethod
     def unwrap_list(in_list):
-        """Replace all CscWrappers elements with their underlying data"""
-        is_tuple = isinstance(in_list, tuple)
-        is_set = isinstance(in_list, set)
-        #if is_tuple or is_set:
-            #in_list = list(in_list)
+        """Replace all CscWrappers elements with their underlying data
         
-        results = []
-        for value in in_list:
-            if isinstance(value, CscWrapper):
-                results.append(value.unwrap())
-            elif isinstance(value, tuple) or isinstance(value, list) or isinstance(value, set):
-                results.append(CscWrapper.unwrap_list(value))
-            else:
-                results.append(value)
+        When no element needs unwrapping in_list itself is returned, so the
+        common case of passing ids, frames and values allocates nothing.
+        """
+        #find the first element that needs unwrapping, if any
+        for index, value in enumerate(in_list):
+            if isinstance(value, _UNWRAPPABLE_TYPES):
+                if isinstance(value, CscWrapper) or CscWrapper.unwrap_list(value) is not value:
+                    break
+        else:
+            return in_list
+        
+        results = list(itertools.islice(in_list, index))
+        for value in itertools.islice(in_list, index, None):
+            if isinstance(value, _UNWRAPPABLE_TYPES):
+                if isinstance(value, CscWrapper):
+                    value = value.unwrap()
+                else:
+                    value = CscWrapper.unwrap_list(value)
+                    
+            results.append(value)
                 
-        if is_tuple:
+        if isinstance(in_list, tuple):
             results = tuple(results)
-        elif is_set:
+        elif isinstance(in_list, set):
             results = set(results)
                 
         return results
@@ -205,10 +431,11 @@ class CscWrapper(object):
     def unwrap_dict(in_dict):
         """Replace all CscWrappers elements with their underlying data"""
         for key, value in in_dict.items():
-            if isinstance(value, CscWrapper):
-                in_dict[key] = value.unwrap()
-            elif isinstance(value, tuple) or isinstance(value, list) or isinstance(value, set):
-                in_dict[key] = CscWrapper.unwrap_list(value)
+            if isinstance(value, _UNWRAPPABLE_TYPES):
+                if isinstance(value, CscWrapper):
+                    in_dict[key] = value.unwrap()
+                else:
+                    in_dict[key] = CscWrapper.unwrap_list(value)
 
            
     @staticmethod
@@ -237,6 +464,28 @@ class CscWrapper(object):
             
         return CscWrapper._class_wrappers
     
+    
+    @staticmethod
+    def _get_wrap_dispatch(data_class) -> tuple:
+        """Returns how wrap() should treat instances of data_class
+        
+        The answer is memoized for every class seen, including classes that
+        are never wrapped, like the floats and vectors returned by the api.
+        
+        Returns:
+            tuple: (has an is_null method, the mapped wrapper class or None,
+            is a csc class)
+        """
+        dispatch = CscWrapper._wrap_dispatch.get(data_class)
+        if dispatch is None:
+            #don't use __class__.__name__ here, because it might not contain the csc.
+            dispatch = (hasattr(data_class, 'is_null'),
+                        CscWrapper.get_class_wrappers().get(data_class),
+                        str(data_class).startswith("<class 'csc."))
+            CscWrapper._wrap_dispatch[data_class] = dispatch
+            
+        return dispatch
+    
         
     @staticmethod
     def wrap(data: object, creator: object) -> typing.Type[CscWrapper] | typing.Any | None: #, default_class = None) -> CscWrapper:
@@ -246,34 +495,31 @@ class CscWrapper(object):
             data: The data to wrap
             creator: The owner of the data. Use None if there is no creator.
         """
-        if hasattr(data, 'is_null') and data.is_null():
+        has_is_null, wrapper, is_csc_class = CscWrapper._get_wrap_dispatch(data.__class__)
+        if has_is_null and data.is_null():
             return None
         
-        class_wrappers = CscWrapper.get_class_wrappers()
-                    
-        wrapper = None
-        if data.__class__ in class_wrappers:
-            wrapper = class_wrappers[data.__class__]
-            #print('found mapping')
+        if wrapper is None:
+            #this must be a data that's not csc specific.
+            if not is_csc_class:
+                return data
             
-        if wrapper and wrapper == PyGuid:
-            if isinstance(creator, GuidMapper) and creator.guid_class is not None:
-                wrapper = creator.guid_class
-             
-        #I want this code, but right now it's breaking stuff.
-        #Specifically it doesn't play nice with DataId at a minimum
-        ###If we haven't found anything by now and this is csc class
-        ###we'll want a generic wrapper around it, so the getters and setters work
-        ###don't use __class__.__name__ here, because it might not contain the csc.
-        if not wrapper and str(data.__class__).startswith("<class 'csc."):
+            #I want this code, but right now it's breaking stuff.
+            #Specifically it doesn't play nice with DataId at a minimum
+            ###If we haven't found anything by now and this is csc class
+            ###we'll want a generic wrapper around it, so the getters and setters work
             if isinstance(creator, SceneElement):
                 wrapper = SceneElement
             else:
                 wrapper = CscWrapper
-            
-        #this must be a data that's not csc specific.
-        if wrapper is None:
-            return data
+                
+        elif wrapper == PyGuid:
+            if isinstance(creator, GuidMapper) and creator.guid_class is not None:
+                wrapper = creator.guid_class
+                
+        #ids are handed out by the scene, so its identity map can be used
+        if issubclass(wrapper, PyGuid) and isinstance(creator, SceneElement) and creator.scene is not None:
+            return creator.scene._get_wrapper(wrapper, data, creator)
 
         #let's return the wrapped data
         return wrapper(data, creator)        
@@ -291,6 +537,12 @@ class CscWrapper(object):
         while isinstance(data, CscWrapper):
             data = data.unwrap()        
         
+        if self.__bound_names and data is not None and data.__class__ is not self.__bound_class:
+            #the stored callables belong to the old class's api
+            for attr in self.__bound_names:
+                self.__dict__.pop(attr, None)
+            self.__bound_names = None
+            
         self.__data = data
    
               
@@ -333,6 +585,11 @@ class CscWrapper(object):
 
 
 
+#values CscWrapper.unwrap_list/unwrap_dict must replace or look inside of
+_UNWRAPPABLE_TYPES = (CscWrapper, list, tuple, set)
+
+
+
 class SceneElement(CscWrapper):
     """Base class used to represent any wrapped data existing/related to a scene
     
@@ -480,6 +737,154 @@ class PyScene(SceneElement):
         self.su = None        
         self.sess = None
         
+        #edits queued by an open transaction()
+        self._pending_edits = None
+        
+        #BehaviourEditor methods resolved during the current edit
+        self._behaviour_editor_methods = {}
+        
+        #editor wrappers shared by every edit, see _start_editing()
+        self._editor_pool = None
+        
+        #bumped each time an edit that may have changed the objects, their
+        #names, behaviours or hierarchy completes, so cached scene data knows
+        #when it's out of date.
+        self._generation = 0
+        #ObjectId -> how often the behaviour caches of the object were flushed
+        #during the current generation, see flush_object_cache()
+        self._object_flushes = {}
+        #set when an edit that isn't marked as data only runs in the current
+        #modify, see edit()
+        self._structure_edited = False
+        self._indexes = {}
+        
+        self._identity_map = None
+        
+        
+    @property
+    def generation(self):
+        """A counter that changes every time a structural edit of the scene completes
+        
+        Every edit is structural, except the ones cg3dguru knows only set
+        values: setting data or settings (other than a behaviourName), the
+        selection or the current frame. Those leave the generation, and so
+        the scene indexes and behaviour caches, untouched.
+        """
+        return self._generation
+    
+    
+    def flush_cache(self):
+        """Invalidates all cached scene data, like the scene indexes
+        
+        Structural edits made through PyScene.edit do this automatically.
+        Call it when the scene was changed by other means (the UI, or a
+        direct call to a csc.domain.Scene modify method).
+        """
+        self._bump_generation()
+        
+        
+    def _bump_generation(self):
+        self._generation += 1
+        #the generation alone invalidates every object
+        self._object_flushes.clear()
+        
+        
+    def flush_object_cache(self, scene_object: PyObject | csc.model.ObjectId):
+        """Invalidates the behaviour cache of every PyObject wrapping the object
+        
+        Unlike PyObject.flush_cache() called on a single wrapper, this reaches
+        the other PyObjects of the same ObjectId, so it's safe in the middle
+        of an edit.
+        """
+        if isinstance(scene_object, CscWrapper):
+            scene_object = scene_object.unwrap()
+            
+        self._object_flushes[scene_object] = self._object_flushes.get(scene_object, 0) + 1
+        
+        
+    def _get_object_cache_key(self, object_id: csc.model.ObjectId) -> tuple:
+        """Identifies the state of the scene a behaviour cache of the object was built for"""
+        return (self._generation, self._object_flushes.get(object_id, 0))
+        
+        
+    def _get_index(self, index_class):
+        """Returns the scene's index of the given class, rebuilt if stale"""
+        index = self._indexes.get(index_class)
+        if index is None or index.generation != self._generation:
+            index = index_class(self)
+            self._indexes[index_class] = index
+            
+        return index
+    
+    
+    @property
+    def identity_map(self) -> IdentityMap | None:
+        """The IdentityMap used by the scene, or None when it's disabled"""
+        return self._identity_map
+    
+    
+    def enable_identity_map(self, max_size: int | None=None):
+        """Hand back the same wrapper every time the same id is wrapped
+        
+        With the identity map enabled, wrapping an ObjectId, BehaviourId or
+        other id of this scene returns the existing PyObject, PyBehaviour...
+        while it's alive, so their caches survive between api calls.
+        
+        Args:
+            max_size: When given, the most recently used wrappers (up to
+            max_size) are kept alive even when nothing else references them.
+        """
+        self._identity_map = IdentityMap(max_size)
+        
+        
+    def disable_identity_map(self):
+        self._identity_map = None
+        
+        
+    def _get_wrapper(self, wrapper_class, data, creator):
+        """Returns a wrapper_class instance for data, reusing existing ones"""
+        if isinstance(data, CscWrapper):
+            data = data.unwrap()
+            
+        if self._identity_map is None:
+            return wrapper_class(data, creator)
+        
+        return self._identity_map.get_wrapper(wrapper_class, data, creator)
+    
+    
+    def get_name_index(self) -> NameIndex:
+        """Returns the NameIndex of the scene"""
+        return self._get_index(NameIndex)
+    
+    
+    def get_type_index(self) -> TypeIndex:
+        """Returns the TypeIndex of the scene"""
+        return self._get_index(TypeIndex)
+    
+    
+    def get_hierarchy_index(self) -> HierarchyIndex:
+        """Returns the HierarchyIndex of the scene"""
+        return self._get_index(HierarchyIndex)
+    
+    
+    def get_dynamic_behaviour_index(self) -> DynamicBehaviourIndex:
+        """Returns the DynamicBehaviourIndex of the scene"""
+        return self._get_index(DynamicBehaviourIndex)
+    
+    
+    def get_behaviour_index(self) -> BehaviourIndex:
+        """Returns the BehaviourIndex of the scene"""
+        return self._get_index(BehaviourIndex)
+    
+    
+    def _get_built_index(self, index_class):
+        """Returns the index of the given class if it's up to date, else None"""
+        index = self._indexes.get(index_class)
+        if index is None or index.generation != self._generation:
+            return None
+        
+        return index
+        
         
     @property
     def editing(self):
@@ -492,17 +897,88 @@ class PyScene(SceneElement):
                        ):
         self._editing = True
         self._update_accessed = False
-        
-        self.me = SceneElement(model_editor, self) #model editor
-        self.ue = UpdateEditor(update_editor, self) #update editor
-        self.su = SceneElement(scene_updater, self) #scene updater
-        self.sess = SceneElement(session, self) #session
+        self._structure_edited = False
+        self._behaviour_editor_methods.clear()
+        
+        if self._editor_pool is None:
+            #the wrappers are reused by every edit and rebound to the new
+            #csc editors, instead of being re-created each time.
+            self._editor_pool = (
+                SceneElement(None, self), #model editor
+                UpdateEditor(None, self), #update editor
+                SceneElement(None, self), #scene updater
+                SceneElement(None, self), #session
+                BehaviourEditor(None, self), #behaviour editor
+                SceneElement(None, self), #data editor
+                LayersEditor(None, self), #layers editor
+            )
+            
+        self.me, self.ue, self.su, self.sess, self.be, self.de, self.le = self._editor_pool
+        self.me.replace_data(model_editor)
+        self.ue.replace_data(update_editor)
+        self.su.replace_data(scene_updater)
+        self.sess.replace_data(session)
 
-        self.be = BehaviourEditor(model_editor.behaviour_editor(), self) #behaviour editor
-        self.de = SceneElement(model_editor.data_editor(), self) #data editor
-        self.le = LayersEditor(model_editor.layers_editor(), self) #layers editor
+        self.be.replace_data(model_editor.behaviour_editor())
+        self.de.replace_data(model_editor.data_editor())
+        self.le.replace_data(model_editor.layers_editor())
+        
         
+    def _get_behaviour_editor_method(self, operation: str) -> typing.Callable:
+        """Returns the BehaviourEditor method behind a PyBehaviour operation
+        
+        Methods are resolved once per edit session. See
+        PyBehaviour.EDITOR_METHODS for the available operations.
+        """
+        method = self._behaviour_editor_methods.get(operation)
+        if method is None:
+            method = getattr(self.beh_editor, PyBehaviour.EDITOR_METHODS[operation])
+            self._behaviour_editor_methods[operation] = method
+            
+        return method
+    
+    
+    def edit_behaviours(self, edits: typing.Iterable[tuple], title: str='Edit Behaviours') -> list:
+        """Apply many behaviour editor operations inside a single edit
         
+        Args:
+            edits: (behaviour, operation, args) tuples, where operation is one
+            of the PyBehaviour.EDITOR_METHODS keys and args are the arguments
+            the matching PyBehaviour method takes. For Example:
+            
+            scene.edit_behaviours([(beh, 'hide', (True,)),
+                                   (beh, 'set_string', ('name', 'value'))])
+            title: The title of the modify operation
+            
+        Returns:
+            list: The result of each operation. Inside a transaction the edits
+            are queued, so the list is returned empty (and a scene warning is
+            logged) and filled in when the transaction is applied.
+        """
+        self._warn_queued_result('PyScene.edit_behaviours')
+        edits = list(edits)
+        for behaviour, operation, args in edits:
+            if operation not in PyBehaviour.EDITOR_METHODS:
+                raise ValueError("Unknown behaviour operation: {}".format(operation))
+            
+        #the owner of a deleted behaviour can't be looked up after the edit
+        deleted_owners = [behaviour.object for behaviour, operation, args in edits if operation == 'delete_self']
+            
+        results = []
+        def _edit_behaviours():
+            for behaviour, operation, args in edits:
+                func = self._get_behaviour_editor_method(operation)
+                results.append(func(behaviour, *args))
+                
+            #flushed once the deletes are applied, which a transaction delays
+            for owner in deleted_owners:
+                owner.flush_cache()
+                
+        data_only = all(PyBehaviour.is_data_operation(operation, args) for behaviour, operation, args in edits)
+        self.edit(title, _edit_behaviours, _internal_edit=True, _data_only=data_only)
+        return results
+    
+    
     @SceneElement.update_editor.getter
     def update_editor(self):
         self._update_accessed = True
@@ -514,9 +990,21 @@ class PyScene(SceneElement):
         self._update_accessed = False
         self.me = self.be = self.de = self.le = None
         self.ue = self.su = self.sess = None
+        #the csc editors are only valid during the modify, so the pooled
+        #wrappers must not keep them reachable.
+        if self._editor_pool is not None:
+            for editor in self._editor_pool:
+                editor.replace_data(None)
+            
+        self._behaviour_editor_methods.clear()
+        if self._structure_edited:
+            self._bump_generation()
+            self._structure_edited = False
           
         
-    def edit(self, title: str, callback: typing.Callable, *callback_args, _internal_edit=False, **callback_kwargs):
+    @instrumentation.instrument('PyScene.edit')
+    def edit(self, title: str, callback: typing.Callable, *callback_args, _internal_edit=False, _data_only=False,
+             **callback_kwargs):
         """Used to allow proper editing of scene content.
         
         Provides access to the domain_scene.editors and updaters. If an edit
@@ -529,12 +1017,22 @@ class PyScene(SceneElement):
             title: The title of the modify operation
             callback: the function/method to run after the editors are
             initialized
+            _data_only: For internal use. The callback only sets values (data,
+            settings, the selection...), so the scene indexes and behaviour
+            caches stay valid. See PyScene.generation.
         """
         def _scene_edit(model_editor, update_editor, scene_updater, session):
-            self._start_editing(model_editor, update_editor, scene_updater, session)        
-            callback(*callback_args, **callback_kwargs)          
-            scene_updater.generate_update()
-            self._stop_editing()
+            try:
+                self._start_editing(model_editor, update_editor, scene_updater, session)
+                if not _data_only:
+                    self._structure_edited = True
+                    
+                callback(*callback_args, **callback_kwargs)
+                scene_updater.generate_update()
+            finally:
+                #an exception aborts the modify, so the scene must not be
+                #left thinking it's still editing.
+                self._stop_editing()
             
             
         if not _internal_edit:
@@ -543,7 +1041,12 @@ class PyScene(SceneElement):
             callback_args.insert(0, self)
     
         if self._editing:
+            if not _data_only:
+                self._structure_edited = True
+                
             callback(*callback_args, **callback_kwargs)
+        elif self._pending_edits is not None:
+            self._pending_edits.append((callback, callback_args, callback_kwargs, _data_only))
         else:
             if _internal_edit:
                 self.dom_scene.warning("Scene edits should be made through PyScene.edit")
@@ -552,6 +1055,65 @@ class PyScene(SceneElement):
             self.ds.modify_update_with_session(title, _scene_edit)
             #except Exception as e:
                 #print(e)
+                
+                
+    @property
+    def queuing(self) -> bool:
+        """True inside a transaction(), where edits are queued instead of applied"""
+        return self._pending_edits is not None and not self._editing
+    
+    
+    def _warn_queued_result(self, method_name: str):
+        """Warn that method_name can't return the result of its queued edit"""
+        if self.queuing:
+            self.dom_scene.warning("{} was called inside a PyScene.transaction, the edit is queued "
+                                   "so its result isn't returned".format(method_name))
+            
+            
+    @contextlib.contextmanager
+    def transaction(self, title: str):
+        """Coalesce every edit made inside a with block into one modify
+        
+        Edits requested through PyScene.edit inside the block are queued and
+        applied in a single modify operation when the block exits, followed
+        by a single scene_updater.generate_update(). This produces one undo
+        entry no matter how many values are set. If the block raises, the
+        queued edits are discarded and the scene is left untouched.
+        
+        Edits are applied when the block exits, so reads made inside the block
+        won't see the queued changes. Methods that return the result of an
+        edit (create_object, add_behaviour, create_data, create_setting)
+        return None and edit_behaviours returns an empty list, each logging
+        a scene warning. When
+        a transaction is opened inside an edit or another transaction its
+        edits simply join the outer one. For Example:
+        
+        with scene.transaction('Key joints'):
+            for prop in properties:
+                prop.set(0.0, frame=10)
+        Args:
+            title: The title of the modify operation
+        """
+        if self._editing or self._pending_edits is not None:
+            yield self
+            return
+        
+        self._pending_edits = []
+        try:
+            yield self
+            pending_edits = self._pending_edits
+        finally:
+            self._pending_edits = None
+            
+        if not pending_edits:
+            return
+        
+        def _apply_pending_edits(scene):
+            for callback, callback_args, callback_kwargs, data_only in pending_edits:
+                callback(*callback_args, **callback_kwargs)
+                
+        data_only = all(pending_edit[3] for pending_edit in pending_edits)
+        self.edit(title, _apply_pending_edits, _data_only=data_only)
             
         
     def select(self, to_select, *args, **kwargs):
@@ -561,11 +1123,15 @@ class PyScene(SceneElement):
         def _select():
             self.session.take_selector().select(to_select, *args, **kwargs)
         
-        self.edit('Select Object(s)', _select, _internal_edit=True)
+        self.edit('Select Object(s)', _select, _internal_edit=True, _data_only=True)
 
             
     def create_object(self, name: str='') -> PyObject:
-        """Creates a new scene object"""
+        """Creates a new scene object
+        
+        Returns None inside a transaction(), where the edit is queued.
+        """
+        self._warn_queued_result('PyScene.create_object')
         new_object = None
         
         def _create_object():
@@ -574,107 +1140,771 @@ class PyScene(SceneElement):
 
             
         self.edit('Create Object', _create_object, _internal_edit=True)
+        if new_object is None:
+            #the edit was queued by a transaction
+            return None
+        
         return new_object.object_id()
     
     
-    def get_current_frame(self, clamp_to_animation =True):
-        return self.ds.get_current_frame(clamp_animation=clamp_to_animation)
+    def get_current_frame(self, clamp_to_animation =True):
+        return self.ds.get_current_frame(clamp_animation=clamp_to_animation)
+    
+    
+    def set_current_frame(self, frame):
+        def _set_current_frame():
+            self.ds.set_current_frame(frame)
+            
+        self.edit('Set Current Frame', _set_current_frame, _internal_edit=True, _data_only=True)
+        
+      
+    def get_animation_size(self):
+        return self.dv.get_animation_size()
+    
+    
+    def select_frame_range(self, start_end: tuple[int, int]|None = None, clamp_to_animation=True):
+        """Select a time interval.  All layers will be selected.
+        
+        Args:
+            start_end: When no tuple is supplied the entire animation range
+            is selected
+            clamp_to_animation:When True the interval end won't extend past
+            the animation
+        """
+        
+        a_len = self.dv.get_animation_size() - 1
+        if start_end is None:
+            start_end = (0, a_len)
+            
+        if clamp_to_animation:
+            if start_end[0] > a_len:
+                start_end = (a_len, start_end[1])
+            if  start_end[1] > a_len:
+                start_end = (start_end[0], a_len)
+        
+        #this will crash Cascadeur        
+        if start_end[1] < start_end[0]:
+            start_end = (start_end[0], start_end[0])
+            
+        def _select_frame_range():     
+            layer_selector = self.session.take_layers_selector()
+        
+            l_s_with_ids = self.me.layers_selector()
+            selected_layer_ids = l_s_with_ids.all_included_layer_ids()
+            layer_selector.set_full_selection_by_parts(selected_layer_ids, *start_end)
+            
+        self.edit('Select frame range', _select_frame_range, _internal_edit=True, _data_only=True)
+        
+        
+    @instrumentation.instrument('PyScene.snapshot')
+    def snapshot(self, file_path: str, frames: typing.Iterable[int]=None,
+                 objects: typing.Iterable[PyObject | csc.model.ObjectId]=None, chunk_size: int=1024) -> dict:
+        """Write the values of every animated data property to a .npz file
+        
+        The file holds one float64 array per data id, shaped (frames,
+        components), plus a 'frames' array and a 'metadata.json' entry
+        describing each array: the object, behaviour and property it comes
+        from. Values are read chunk_size frames at a time, the same way
+        AnimatableProperty.get_frames() reads them, and streamed into the
+        file, so memory stays bounded no matter how long the shot is. Each
+        chunk is checked against the shape of the first before it's written.
+        The file is written next to file_path and only renamed into place
+        once complete, so a failed snapshot leaves no partial file behind.
+        numpy isn't needed to write the file, but it's the easiest way to
+        read it: numpy.load(file_path).
+        
+        Args:
+            file_path: The .npz file to write
+            frames: The frames to read. Defaults to the whole animation.
+            objects: The objects to read. Defaults to every scene object.
+            chunk_size: The number of frames read and written at once
+            
+        Returns:
+            The metadata written to metadata.json
+            
+        raises:
+            ValueError: If there are no frames to read, or the values of a
+            data id change shape between frames
+        """
+        if frames is None:
+            frames = range(self.get_animation_size())
+            
+        frames = [int(frame) for frame in frames]
+        if not frames:
+            raise ValueError("A snapshot needs at least one frame")
+        
+        if objects is None:
+            objects = self.iter_scene_objects()
+            
+        temp_path = '{}.{}.partial'.format(file_path, os.getpid())
+        try:
+            metadata = self._write_snapshot(temp_path, frames, objects, chunk_size)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+                
+            raise
+        
+        return metadata
+    
+    
+    def _write_snapshot(self, file_path: str, frames: typing.List[int],
+                        objects: typing.Iterable[PyObject | csc.model.ObjectId], chunk_size: int) -> dict:
+        """Write the snapshot archive, see snapshot()"""
+        behaviour_viewer = instrumentation.track(self.bv.unwrap())
+        data_viewer = instrumentation.track(self.dv.unwrap())
+        read_value = data_viewer.get_data_value
+        
+        columns = []
+        skipped = []
+        seen_ids = set()
+        with zipfile.ZipFile(file_path, 'w', zipfile.ZIP_STORED, allowZip64=True) as archive:
+            frame_values = array.array('q', frames)
+            if sys.byteorder != 'little':
+                frame_values.byteswap()
+                
+            archive.writestr('frames.npy', _npy_header('<i8', (len(frames),)) + frame_values.tobytes())
+            
+            for scene_object in objects:
+                if not isinstance(scene_object, CscWrapper):
+                    scene_object = self.mv._wrap(scene_object)
+                    
+                for behaviour, property_name, range_index, data_id in PyScene._iter_data_ids(scene_object, behaviour_viewer):
+                    if data_id in seen_ids or data_viewer.get_data(data_id).mode != csc.model.DataMode.Animation:
+                        continue
+                    
+                    seen_ids.add(data_id)
+                    info = {
+                        'data_id': data_id.to_string(),
+                        'object': scene_object.name,
+                        'object_id': scene_object.unwrap().to_string(),
+                        'behaviour': behaviour.name,
+                        'property': property_name,
+                        'range_index': range_index,
+                    }
+                    column = 'data_{}'.format(len(columns))
+                    components = PyScene._write_column(archive, column, data_id, read_value, frames, chunk_size)
+                    if components is None:
+                        skipped.append(info)
+                        continue
+                    
+                    info['column'] = column
+                    info['components'] = components
+                    columns.append(info)
+                    
+            metadata = {
+                'frame_count': len(frames),
+                'columns': columns,
+                #animated data that isn't numeric, like strings
+                'skipped': skipped,
+            }
+            archive.writestr('metadata.json', json.dumps(metadata, indent=1))
+            
+        return metadata
+    
+    
+    @staticmethod
+    def _iter_data_ids(scene_object: PyObject, behaviour_viewer: csc.model.BehaviourViewer) -> typing.Iterator[tuple]:
+        """Yields (behaviour, property name, range index or None, data id) for every data property"""
+        for behaviour in scene_object.get_behaviours():
+            behaviour_id = behaviour.unwrap()
+            for property_name in behaviour.get_property_names():
+                property_type = behaviour.get_property_type(property_name)
+                if property_type is None or PropertyType.DATA not in property_type:
+                    continue
+                
+                if PropertyType.RANGE in property_type:
+                    data_ids = behaviour_viewer.get_behaviour_data_range(behaviour_id, property_name)
+                    for range_index, data_id in enumerate(data_ids):
+                        if data_id is not None and not data_id.is_null():
+                            yield behaviour, property_name, range_index, data_id
+                else:
+                    data_id = behaviour_viewer.get_behaviour_data(behaviour_id, property_name)
+                    if data_id is not None and not data_id.is_null():
+                        yield behaviour, property_name, None, data_id
+                        
+                        
+    @staticmethod
+    def _write_column(archive: zipfile.ZipFile, column: str, data_id: csc.model.DataId,
+                      read_value: typing.Callable, frames: typing.List[int], chunk_size: int) -> int | None:
+        """Stream the values of one data id into a .npy entry of the archive
+        
+        Returns:
+            The number of components per frame, None if the values aren't
+            numeric and nothing was written.
+            
+        raises:
+            ValueError: If a later chunk doesn't match the shape of the first
+        """
+        first_chunk = frames[:chunk_size]
+        try:
+            rows = _read_frame_array(read_value, data_id, first_chunk)
+            if numpy is not None:
+                components = rows.shape[1]
+            else:
+                components = len(rows) // len(first_chunk)
+                
+            _check_frame_array(rows, len(first_chunk), components)
+        except (TypeError, ValueError):
+            return None
+        
+        with archive.open(column + '.npy', 'w', force_zip64=True) as handle:
+            handle.write(_npy_header('<f8', (len(frames), components)))
+            handle.write(_to_little_endian_bytes(rows))
+            for start in range(chunk_size, len(frames), chunk_size):
+                chunk = frames[start:start + chunk_size]
+                try:
+                    rows = _read_frame_array(read_value, data_id, chunk)
+                    _check_frame_array(rows, len(chunk), components)
+                except (TypeError, ValueError) as e:
+                    raise ValueError("The values of data {} on frames {}-{} don't match the earlier frames".format(
+                        data_id.to_string(), chunk[0], chunk[-1])) from e
+                
+                handle.write(_to_little_endian_bytes(rows))
+                
+        return components
+    
+    
+    @instrumentation.instrument('PyScene.get_scene_objects')
+    def get_scene_objects(self, names = [], selected = False, of_type = '', only_roots = False) -> typing.List[PyObject]:
+        """return a list of scene objects based on the input filters
+        
+        Args:
+            names: what are the specific names you're looking for
+            select: only consider selected object
+            of_type: only consider objects of type (type listed in the outliner)
+            only_roots: only consider objects with no parents
+        """
+        #without names or a selection every object is visited, so the
+        #indexes pay for themselves.
+        build_indexes = not names and not selected
+        return list(self.iter_scene_objects(names, selected, of_type, only_roots, build_indexes=build_indexes))
+    
+    
+    def iter_scene_objects(self, names: typing.Iterable[str]=(), selected: bool=False, of_type: str='',
+                           only_roots: bool=False, limit: int | None=None,
+                           build_indexes: bool=False) -> typing.Iterator[PyObject]:
+        """Yields the scene objects matching the input filters, one at a time
+        
+        Objects are read and wrapped as they're yielded, so stopping early
+        (or passing a limit) skips the api calls for the rest of the scene.
+        The candidates come from the most selective filter given: names, then
+        the selection, then the type. The remaining filters run cheapest
+        first, the selection, then the type and finally the parent. Scene
+        indexes are only used when they're already built.
+        
+        Args:
+            names: Only yield the first object using each name, in the order
+            of names. A NameIndex is built for NAME_INDEX_THRESHOLD or more
+            names.
+            selected: Only yield selected objects
+            of_type: Only yield objects of type (type listed in the outliner)
+            only_roots: Only yield objects with no parents
+            limit: Stop after yielding this many objects
+            build_indexes: Build the type and hierarchy indexes the filters
+            can use. Only worth it when the whole scene is going to be
+            visited. Names are looked up one by one unless the NameIndex is
+            already built.
+        """
+        if limit is not None and limit <= 0:
+            return
+        
+        get_index = self._get_index if build_indexes else self._get_built_index
+        model_viewer = instrumentation.track(self.mv.unwrap())
+        names = list(names)
+        
+        selected_ids = None
+        if selected:
+            selected_ids = self.dom_scene.selector().selected().unwrap().ids
+            
+        type_index = get_index(TypeIndex) if of_type else None
+        if names:
+            #a few names are cheaper to look up one by one than to index
+            name_index = self._get_built_index(NameIndex)
+            if name_index is None and len(names) >= NAME_INDEX_THRESHOLD:
+                name_index = self.get_name_index()
+                
+            candidates = self._iter_named_ids(names, model_viewer, name_index)
+            if selected_ids is not None:
+                selected_ids = set(selected_ids)
+        elif selected_ids is not None:
+            candidates = selected_ids
+            selected_ids = None
+        elif type_index is not None:
+            #the type index already holds exactly the objects we want
+            candidates = type_index.get(of_type)
+            of_type = ''
+        else:
+            candidates = model_viewer.get_objects()
+            
+        hierarchy = None
+        behaviour_viewer = None
+        if only_roots:
+            hierarchy = get_index(HierarchyIndex)
+            if hierarchy is None:
+                behaviour_viewer = instrumentation.track(self.bv.unwrap())
+                
+        count = 0
+        for object_id in candidates:
+            if selected_ids is not None and object_id not in selected_ids:
+                continue
+            
+            if of_type:
+                if type_index is not None:
+                    type_name = type_index.get_type_name(object_id)
+                else:
+                    type_name = model_viewer.get_object_type_name(object_id)
+                    
+                if type_name != of_type:
+                    continue
+                
+            if only_roots:
+                if hierarchy is not None:
+                    parent_id = hierarchy.get_parent(object_id)
+                else:
+                    parent_id = HierarchyIndex.read_parent(behaviour_viewer, object_id)
+                    
+                if parent_id is not None:
+                    continue
+                
+            yield self.mv._wrap(object_id)
+            count += 1
+            if count == limit:
+                return
+            
+            
+    def query(self) -> SceneQuery:
+        """Returns a SceneQuery over the objects of the scene
+        
+        For Example:
+        scene.query().type('Joint').name_matches('^L_').has_behaviour('Dynamic').all()
+        """
+        #query builds on the classes of this module
+        from .query import SceneQuery
+        return SceneQuery(self)
+    
+    
+    def first_scene_object(self, names: typing.Iterable[str]=(), selected: bool=False, of_type: str='',
+                           only_roots: bool=False) -> PyObject | None:
+        """Returns the first object iter_scene_objects() yields, else None"""
+        return next(self.iter_scene_objects(names, selected, of_type, only_roots, limit=1), None)
+    
+    
+    @staticmethod
+    def _iter_named_ids(names: typing.List[str], model_viewer: csc.model.ModelViewer,
+                        name_index: NameIndex | None) -> typing.Iterator[csc.model.ObjectId]:
+        """Yields the id of the first object using each name, in the order of names
+        
+        Without an up to date NameIndex each name is looked up with its own
+        ModelViewer.get_objects(name) call.
+        """
+        for name in names:
+            if name_index is not None:
+                object_ids = name_index.get(name)
+            else:
+                object_ids = model_viewer.get_objects(name)
+                
+            if object_ids:
+                yield object_ids[0]
+    
+    
+    def get_objects_by_name(self, name: str) -> typing.List[PyObject]:
+        """Returns every object using the given name"""
+        name_index = self._get_built_index(NameIndex)
+        if name_index is None:
+            return self.mv.get_objects(name)
+        
+        return self.mv._wrap_result(name_index.get(name))
+    
+    
+    def get_objects_by_prefix(self, prefix: str) -> typing.List[PyObject]:
+        """Returns every object whose name starts with the given prefix"""
+        return self.mv._wrap_result(self.get_name_index().get_prefixed(prefix))
+    
+    
+    def get_objects_of_type(self, *type_names: str) -> typing.List[PyObject]:
+        """Returns every object matching any of the given type names
+        
+        The type names are the ones listed in the outliner.
+        """
+        type_index = self.get_type_index()
+        found_ids = []
+        for type_name in type_names:
+            found_ids.extend(type_index.get(type_name))
+            
+        return self.mv._wrap_result(found_ids)
+    
+    
+    def count_by_type(self) -> typing.Dict[str, int]:
+        """Returns how many objects of each type exist in the scene"""
+        return self.get_type_index().count_by_type()
+    
+    
+    def get_dynamic_behaviours(self, name: str) -> typing.List[PyBehaviour]:
+        """Returns every Dynamic behaviour in the scene with the given name
+        
+        The name is the behaviourName of the Dynamic behaviour, the same
+        value returned by PyBehaviour.name.
+        """
+        return self.get_dynamic_behaviour_index().get(name)
+    
+    
+    def get_objects_with_dynamic_behaviour(self, name: str) -> typing.List[PyObject]:
+        """Returns every object holding a Dynamic behaviour of the given name"""
+        return self.mv._wrap_result(self.get_dynamic_behaviour_index().get_owners(name))
+    
+    
+    
+class IdentityMap(object):
+    """Maps csc ids to the single wrapper instance representing them
+    
+    Wrappers are held weakly and are keyed by the id and the wrapper class.
+    With a max_size the most recently requested wrappers are also held
+    strongly, so their caches survive even when callers drop them, while
+    memory stays bounded on very large scenes.
+    """
+    
+    def __init__(self, max_size: int | None=None):
+        self._wrappers = weakref.WeakValueDictionary()
+        self._max_size = max_size
+        self._recent = collections.OrderedDict() if max_size else None
+        
+        
+    def __len__(self):
+        return len(self._wrappers)
+    
+    
+    @property
+    def max_size(self):
+        return self._max_size
+    
+    
+    def get_wrapper(self, wrapper_class, data, creator):
+        """Returns the wrapper of data, creating it if needed"""
+        key = (data, wrapper_class)
+        try:
+            wrapper = self._wrappers.get(key)
+        except TypeError:
+            #unhashable data can't be tracked
+            return wrapper_class(data, creator)
+        
+        if wrapper is None:
+            wrapper = wrapper_class(data, creator)
+            self._wrappers[key] = wrapper
+            
+        if self._recent is not None:
+            self._recent[key] = wrapper
+            self._recent.move_to_end(key)
+            if len(self._recent) > self._max_size:
+                self._recent.popitem(last=False)
+                
+        return wrapper
+    
+    
+    def clear(self):
+        self._wrappers.clear()
+        if self._recent is not None:
+            self._recent.clear()
+            
+            
+            
+#The number of names PyScene.iter_scene_objects() looks up one at a time.
+#Each ModelViewer.get_objects(name) call scans every object of the scene, so
+#more names than this are found through a NameIndex instead.
+NAME_INDEX_THRESHOLD = 32
+
+
+
+class SceneIndex(object):
+    """Base class for lookup tables built from a single pass over a scene
+    
+    An index is only valid for the scene generation it was built for.
+    PyScene rebuilds it on the next request after an edit completes.
+    """
+    
+    def __init__(self, scene: PyScene):
+        self.generation = scene.generation
+        with instrumentation.operation('{}._build'.format(self.__class__.__name__)):
+            self._build(scene)
+        
+        
+    def _build(self, scene: PyScene):
+        raise NotImplementedError
+    
+    
+    
+class NameIndex(SceneIndex):
+    """Maps object names to the csc.model.ObjectIds using them"""
+    
+    def _build(self, scene):
+        model_viewer = instrumentation.track(scene.mv.unwrap())
+        self._ids_by_name = {}
+        self._names = {}
+        for object_id in model_viewer.get_objects():
+            name = model_viewer.get_object_name(object_id)
+            self._names[object_id] = name
+            object_ids = self._ids_by_name.get(name)
+            if object_ids is None:
+                self._ids_by_name[name] = [object_id]
+            else:
+                object_ids.append(object_id)
+                
+        self._sorted_names = None
+        
+        
+    def __len__(self):
+        return len(self._ids_by_name)
+        
+        
+    def get(self, name: str) -> typing.List[csc.model.ObjectId]:
+        """Returns the ids of every object with the given name"""
+        return list(self._ids_by_name.get(name, ()))
+    
+    
+    def get_prefixed(self, prefix: str) -> typing.List[csc.model.ObjectId]:
+        """Returns the ids of every object whose name starts with prefix"""
+        if self._sorted_names is None:
+            self._sorted_names = sorted(self._ids_by_name)
+            
+        found_ids = []
+        start = bisect.bisect_left(self._sorted_names, prefix)
+        for name in self._sorted_names[start:]:
+            if not name.startswith(prefix):
+                break
+            
+            found_ids.extend(self._ids_by_name[name])
+            
+        return found_ids
+    
+    
+    def get_matching(self, regex: typing.Pattern) -> typing.List[csc.model.ObjectId]:
+        """Returns the ids of every object whose name matches the compiled regex (search)"""
+        found_ids = []
+        for name, object_ids in self._ids_by_name.items():
+            if regex.search(name) is not None:
+                found_ids.extend(object_ids)
+                
+        return found_ids
+    
+    
+    def get_name(self, object_id: csc.model.ObjectId) -> str | None:
+        """Returns the name of the object, None if it isn't in the scene"""
+        return self._names.get(object_id)
+    
+    
+    
+class TypeIndex(SceneIndex):
+    """Maps object type names to the csc.model.ObjectIds of that type"""
+    
+    def _build(self, scene):
+        model_viewer = instrumentation.track(scene.mv.unwrap())
+        self._ids_by_type = {}
+        self._type_names = {}
+        for object_id in model_viewer.get_objects():
+            type_name = model_viewer.get_object_type_name(object_id)
+            self._type_names[object_id] = type_name
+            object_ids = self._ids_by_type.get(type_name)
+            if object_ids is None:
+                self._ids_by_type[type_name] = [object_id]
+            else:
+                object_ids.append(object_id)
+                
+                
+    def __len__(self):
+        return len(self._ids_by_type)
+    
+    
+    def get(self, type_name: str) -> typing.List[csc.model.ObjectId]:
+        """Returns the ids of every object of the given type"""
+        return list(self._ids_by_type.get(type_name, ()))
     
     
-    def set_current_frame(self, frame):
-        def _set_current_frame():
-            self.ds.set_current_frame(frame)
-            
-        self.edit('Set Current Frame', _set_current_frame, _internal_edit=True)
-        
-      
-    def get_animation_size(self):
-        return self.dv.get_animation_size()
+    def get_type_name(self, object_id: csc.model.ObjectId) -> str | None:
+        """Returns the type name of the object, None if it isn't in the scene"""
+        return self._type_names.get(object_id)
     
     
-    def select_frame_range(self, start_end: tuple[int, int]|None = None, clamp_to_animation=True):
-        """Select a time interval.  All layers will be selected.
+    def count_by_type(self) -> typing.Dict[str, int]:
+        """Returns the number of objects of each type"""
+        return {type_name:len(object_ids) for type_name, object_ids in self._ids_by_type.items()}
+    
+    
+    
+class HierarchyIndex(SceneIndex):
+    """The parent/children relationships of every object in the scene
+    
+    The relationships come from the 'parent' property of each object's
+    'Basic' behaviour.
+    """
+    
+    def _build(self, scene):
+        behaviour_viewer = instrumentation.track(scene.bv.unwrap())
+        self._parents = {}
+        self._children = {}
+        self._roots = []
+        for object_id in instrumentation.track(scene.mv.unwrap()).get_objects():
+            parent_id = HierarchyIndex.read_parent(behaviour_viewer, object_id)
+            self._parents[object_id] = parent_id
+            if parent_id is None:
+                self._roots.append(object_id)
+            elif parent_id in self._children:
+                self._children[parent_id].append(object_id)
+            else:
+                self._children[parent_id] = [object_id]
+                
+                
+    @staticmethod
+    def read_parent(behaviour_viewer: csc.model.BehaviourViewer, object_id: csc.model.ObjectId) -> csc.model.ObjectId | None:
+        """Reads the parent of a single object straight from the api
         
         Args:
-            start_end: When no tuple is supplied the entire animation range
-            is selected
-            clamp_to_animation:When True the interval end won't extend past
-            the animation
+            behaviour_viewer: The unwrapped csc.model.BehaviourViewer
+            object_id: The unwrapped csc.model.ObjectId
         """
-        
-        a_len = self.dv.get_animation_size() - 1
-        if start_end is None:
-            start_end = (0, a_len)
-            
-        if clamp_to_animation:
-            if start_end[0] > a_len:
-                start_end = (a_len, start_end[1])
-            if  start_end[1] > a_len:
-                start_end = (start_end[0], a_len)
-        
-        #this will crash Cascadeur        
-        if start_end[1] < start_end[0]:
-            start_end = (start_end[0], start_end[0])
-            
-        def _select_frame_range():     
-            layer_selector = self.session.take_layers_selector()
-        
-            l_s_with_ids = self.me.layers_selector()
-            selected_layer_ids = l_s_with_ids.all_included_layer_ids()
-            layer_selector.set_full_selection_by_parts(selected_layer_ids, *start_end)
+        for behaviour_id in behaviour_viewer.get_behaviours(object_id):
+            if behaviour_viewer.get_behaviour_name(behaviour_id) == 'Basic':
+                parent_id = behaviour_viewer.get_behaviour_object(behaviour_id, 'parent')
+                if parent_id is None or parent_id.is_null():
+                    return None
+                
+                return parent_id
             
-        self.edit('Select frame range', _select_frame_range, _internal_edit=True)
-        
-
+        return None
     
-    def get_scene_objects(self, names = [], selected = False, of_type = '', only_roots = False) -> typing.List[PyObject]:
-        """return a list of scene objects based on the input filters
-        
-        Args:
-            names: what are the specific names you're looking for
-            select: only consider selected object
-            of_type: only consider objects of type (type listed in the outliner)
-            only_roots: only consider objects with no parents
-        """
-        
-        def _get_by_name():
-            found_guids = []
-            for name in names:
-                result = self.mod_viewer.get_objects(name)
-                if result:
-                    found_guids.append(result[0])
-                        
-            return found_guids
-        
-        name_list = []
-        if selected:
-            found_objects = self.dom_scene.selector().selected().ids
-            if names:
-                name_list = _get_by_name()
-        elif names:
-            found_objects = _get_by_name()
-        else:
-            found_objects = self.mod_viewer.get_objects()
     
-        
-        if name_list:
-            set_a = set(name_list)
-            set_b = set(found_objects)
-            
-            set_b.intersection_update(set_a)
-            found_objects = list(set_b)
-            
+    def __len__(self):
+        return len(self._parents)
+    
+    
+    def get_parent(self, object_id: csc.model.ObjectId) -> csc.model.ObjectId | None:
+        return self._parents.get(object_id)
+    
+    
+    def get_children(self, object_id: csc.model.ObjectId) -> typing.List[csc.model.ObjectId]:
+        return list(self._children.get(object_id, ()))
+    
+    
+    def get_roots(self) -> typing.List[csc.model.ObjectId]:
+        return list(self._roots)
+    
+    
+    def iter_descendants(self, object_id: csc.model.ObjectId) -> typing.Iterator[csc.model.ObjectId]:
+        """Yields every object below the given object, depth first"""
+        stack = list(reversed(self._children.get(object_id, ())))
+        while stack:
+            child_id = stack.pop()
+            yield child_id
+            stack.extend(reversed(self._children.get(child_id, ())))
             
-        if of_type:
-            found_objects = [obj for obj in found_objects if self.mod_viewer.get_object_type_name(obj) == of_type]
             
-        if only_roots:
-            found_objects = [obj for obj in found_objects if obj.parent is None]
+    def iter_ancestors(self, object_id: csc.model.ObjectId) -> typing.Iterator[csc.model.ObjectId]:
+        """Yields the parent of the object, then its parent and so on"""
+        parent_id = self._parents.get(object_id)
+        visited = set()
+        while parent_id is not None and parent_id not in visited:
+            visited.add(parent_id)
+            yield parent_id
+            parent_id = self._parents.get(parent_id)
+
+    
+    
+class DynamicBehaviourIndex(SceneIndex):
+    """Maps the names of Dynamic behaviours to the behaviours using them"""
+    
+    def _build(self, scene):
+        behaviour_viewer = instrumentation.track(scene.bv.unwrap())
+        self._behaviours_by_name = {}
+        self._owners_by_name = {}
+        for object_id in instrumentation.track(scene.mv.unwrap()).get_objects():
+            for behaviour_id in behaviour_viewer.get_behaviours(object_id):
+                if not behaviour_viewer.get_behaviour_name(behaviour_id).startswith('Dynamic'):
+                    continue
+                
+                behaviour = scene.bv._wrap(behaviour_id)
+                name = behaviour.name
+                if name in self._behaviours_by_name:
+                    self._behaviours_by_name[name].append(behaviour)
+                    owners = self._owners_by_name[name]
+                    if owners[-1] != object_id:
+                        owners.append(object_id)
+                else:
+                    self._behaviours_by_name[name] = [behaviour]
+                    self._owners_by_name[name] = [object_id]
+                    
+                    
+    def __len__(self):
+        return len(self._behaviours_by_name)
+    
+    
+    def get_names(self) -> typing.List[str]:
+        """Returns the names of all the Dynamic behaviours in the scene"""
+        return list(self._behaviours_by_name)
+    
+    
+    def get(self, name: str) -> typing.List[PyBehaviour]:
+        """Returns the Dynamic behaviours with the given name"""
+        return list(self._behaviours_by_name.get(name, ()))
+    
+    
+    def get_owners(self, name: str) -> typing.List[csc.model.ObjectId]:
+        """Returns the ids of the objects holding a Dynamic behaviour of the given name"""
+        return list(self._owners_by_name.get(name, ()))
+    
+    
+    
+class BehaviourIndex(SceneIndex):
+    """Maps behaviour names to the csc.model.ObjectIds holding them
+    
+    Names are the ones PyObject.has_behaviour() uses, so Dynamic behaviours
+    are listed under their behaviourName. They're also listed under the name
+    of their behaviour type, 'Dynamic', so every object holding a Dynamic
+    behaviour can be found.
+    """
+    
+    def _build(self, scene):
+        behaviour_viewer = instrumentation.track(scene.bv.unwrap())
+        self._owners_by_name = {}
+        self._owner_sets = {}
+        for object_id in instrumentation.track(scene.mv.unwrap()).get_objects():
+            for behaviour_id in behaviour_viewer.get_behaviours(object_id):
+                type_name = behaviour_viewer.get_behaviour_name(behaviour_id)
+                if type_name.startswith('Dynamic'):
+                    names = (type_name, scene.bv._wrap(behaviour_id).name)
+                else:
+                    names = (type_name,)
+                    
+                for name in names:
+                    owners = self._owners_by_name.get(name)
+                    if owners is None:
+                        self._owners_by_name[name] = [object_id]
+                    elif owners[-1] != object_id:
+                        owners.append(object_id)
+                    
+                    
+    def __len__(self):
+        return len(self._owners_by_name)
+    
+    
+    def get_names(self) -> typing.List[str]:
+        """Returns the names of all the behaviours in the scene"""
+        return list(self._owners_by_name)
+    
+    
+    def get_owners(self, name: str) -> typing.List[csc.model.ObjectId]:
+        """Returns the ids of the objects holding a behaviour of the given name"""
+        return list(self._owners_by_name.get(name, ()))
+    
+    
+    def has_behaviour(self, object_id: csc.model.ObjectId, name: str) -> bool:
+        owners = self._owner_sets.get(name)
+        if owners is None:
+            owners = self._owner_sets[name] = set(self._owners_by_name.get(name, ()))
             
-        return found_objects
+        return object_id in owners
+    
+    
     
-         
-                  
 class PyGuid(SceneElement):
     """Base class for wrappping csc.Guid and all Ids"""
 
@@ -706,6 +1936,11 @@ class PyObject(PyGuid):
         super().__init__(*args, **kwargs)
         
         self._behaviours_cache = {}
+        #the Dynamic behaviours of the object by their type name, the cache
+        #above lists them under their behaviourName
+        self._dynamic_types_cache = {}
+        #the PyScene._get_object_cache_key() the cache was built for
+        self._cache_generation = None
         
         
     def __str__(self):
@@ -737,16 +1972,36 @@ class PyObject(PyGuid):
         
         
     @property
-    def children(self):
+    def children(self) -> typing.List[PyObject]:
         """Returns a list of children parented to the current model"""
-        #return self.beh_viewer.get_children(self)
-        pass
+        hierarchy = self.scene.get_hierarchy_index()
+        return self.scene.mv._wrap_result(hierarchy.get_children(self.unwrap()))
     
     
     @property
-    def parent(self):
+    def parent(self) -> PyObject | None:
         """Get's the 'Basic' behaviour parent property value"""
-        return self.Basic.parent.get()
+        #Building the hierarchy index for a single lookup would visit every
+        #object, so only use it when it's already up to date.
+        hierarchy = self.scene._get_built_index(HierarchyIndex)
+        if hierarchy is not None:
+            parent_id = hierarchy.get_parent(self.unwrap())
+        else:
+            parent_id = HierarchyIndex.read_parent(instrumentation.track(self.beh_viewer.unwrap()), self.unwrap())
+            
+        return self.scene.mv._wrap(parent_id)
+    
+    
+    def descendants(self) -> typing.List[PyObject]:
+        """Returns every object below this one in the hierarchy, depth first"""
+        hierarchy = self.scene.get_hierarchy_index()
+        return self.scene.mv._wrap_result(list(hierarchy.iter_descendants(self.unwrap())))
+    
+    
+    def ancestors(self) -> typing.List[PyObject]:
+        """Returns the parent of this object, its parent and so on up to the root"""
+        hierarchy = self.scene.get_hierarchy_index()
+        return self.scene.mv._wrap_result(list(hierarchy.iter_ancestors(self.unwrap())))
     
     
     @parent.setter
@@ -755,7 +2010,7 @@ class PyObject(PyGuid):
         
         
     def get_dynamic_behaviours(self):
-        self._cache_behaviours()
+        self._update_behaviours_cache()
         dynamic_behs = []
         for key, beh_list in self._behaviours_cache.items():
             for beh in beh_list:
@@ -766,12 +2021,17 @@ class PyObject(PyGuid):
 
 
     def get_behaviours_by_name(self, behaviour_name) -> list:
-        """Returns a list of all the behaviours that match the given name"""
+        """Returns a list of all the behaviours that match the given name
+        
+        Dynamic behaviours match their behaviourName, and the name of their
+        behaviour type when no behaviour is named after it.
+        """
         
-        if self.has_behaviour(behaviour_name):
+        self._update_behaviours_cache()
+        if behaviour_name in self._behaviours_cache:
             return self._behaviours_cache[behaviour_name]
         
-        return []
+        return self._dynamic_types_cache.get(behaviour_name, [])
     
     
     def get_behaviour_by_name(self, name) -> PyBehaviour | None:
@@ -799,8 +2059,10 @@ class PyObject(PyGuid):
             raise BehaviourError(attr)
     
     
+    @instrumentation.instrument('PyObject._cache_behaviours')
     def _cache_behaviours(self):
-        self.flush_cache()
+        self._behaviours_cache = {}
+        self._dynamic_types_cache = {}
         
         behaviours = self.get_behaviours() #beh_viewer.get_behaviours(self)
         #try:
@@ -811,35 +2073,61 @@ class PyObject(PyGuid):
             else:
                 self._behaviours_cache[behaviour.name] = [behaviour]
                 
+            if behaviour.is_dynamic:
+                self._dynamic_types_cache.setdefault(behaviour._name, []).append(behaviour)
+                
+        self._cache_generation = self.scene._get_object_cache_key(self.unwrap())
+                
         #except Exception as e:
             #print(e)
             
             
+    def _update_behaviours_cache(self):
+        """Rebuilds the behaviour cache if the scene was edited since it was built"""
+        if self._cache_generation != self.scene._get_object_cache_key(self.unwrap()):
+            self._cache_behaviours()
+            
+            
     def flush_cache(self):
         """PyBehaviours are cached. This invalidates the cache
         
-        This should be called anytime a behaviour has been deleted, so that
-        the object data doesn't hold an invalid reference. 
+        The cache of every PyObject wrapping the same ObjectId is invalidated,
+        see PyScene.flush_object_cache(). The cache is rebuilt automatically
+        after each structural PyScene.edit, and add_behaviour() and
+        PyBehaviour.delete_self() flush the owner right away. This only needs
+        to be called when behaviours were added or deleted by other means
+        (use PyScene.flush_cache() to do this for every object).
         """
-        
-        #ToDo: Really, I should probably not do the caching thing in general.
-        #as I'm not sure it's really a performance hit and risks having wrappers
-        #become out of sync with the underlying data.
         self._behaviours_cache = {}
+        self._dynamic_types_cache = {}
+        self._cache_generation = None
+        self.scene.flush_object_cache(self)
 
             
     def has_behaviour(self, behaviour_name) -> bool:
-        """Returns True if a behaviour of the given name exists else False"""
+        """Returns True if a behaviour of the given name exists else False
         
-        #If a requested behaviour is missing the internal behaviour cache is
-        #rebuild to make sure the data is up to date.
-        if behaviour_name not in self._behaviours_cache:
-            self._cache_behaviours()
-            
-        return behaviour_name in self._behaviours_cache
+        Dynamic behaviours match both their behaviourName and the name of
+        their behaviour type, so has_behaviour('Dynamic') is True for an
+        object holding any Dynamic behaviour, like SceneQuery.has_behaviour().
+        """
+        
+        #The cache holds every behaviour of the object, so a missing name is
+        #known to be absent until the scene is edited.
+        self._update_behaviours_cache()
+        return behaviour_name in self._behaviours_cache or behaviour_name in self._dynamic_types_cache
  
  
     def add_behaviour(self, name: str, dynamic_name=None):
+        """Adds a behaviour to the object and returns it
+        
+        Returns None inside a PyScene.transaction(), where the edit is queued.
+        
+        Args:
+            name: The behaviour type name
+            dynamic_name: The behaviourName of a Dynamic behaviour
+        """
+        self.scene._warn_queued_result('PyObject.add_behaviour')
         add_dynamic = name.startswith('Dynamic')
         output = None
         def _add_behaviour():
@@ -853,6 +2141,10 @@ class PyObject(PyGuid):
                     name_prop.set(dynamic_name)
                 else:
                     raise(Exception("Can't determine behaviourName type for {}".format(self._name)))
+                
+            #the cache is only rebuilt by the scene once the edit completes,
+            #so the new behaviour must be visible to the rest of the edit.
+            self.flush_cache()
                     
             
         if add_dynamic and dynamic_name is None:
@@ -883,8 +2175,10 @@ class PyObject(PyGuid):
             doesn't exist, then one will be made.
             
         Returns:
-            csc.model.Data            
+            csc.model.Data: None inside a PyScene.transaction(), where the
+            edit is queued.
         """
+        self.scene._warn_queued_result('PyObject.create_data')
         result = None
         def _object_add_data():
             nonlocal result
@@ -919,6 +2213,11 @@ class PyObject(PyGuid):
     
     
     def create_setting(self, setting_name: str, mode: csc.model.SettingMode, value, setting_id=None) -> csc.model.Setting:
+        """Wrapper DataEditor.add_setting
+        
+        Returns None inside a PyScene.transaction(), where the edit is queued.
+        """
+        self.scene._warn_queued_result('PyObject.create_setting')
         result = None
         def _object_add_setting():
             nonlocal result
@@ -933,15 +2232,67 @@ class PyObject(PyGuid):
 
 
 
+class BehaviourSchema(object):
+    """The property names of a behaviour and their PropertyTypes
+
+    Property types are resolved on demand. A type of None means the
+    property exists, but its type hasn't been probed yet.
+    """
+
+    def __init__(self, property_names):
+        self.property_names = tuple(property_names)
+        self.property_types: typing.Dict[str, PropertyType | None] = dict.fromkeys(self.property_names)
+
+
+
+class BehaviourSchemaRegistry(object):
+    """Process-wide mapping of behaviour types to their BehaviourSchema
+
+    Every behaviour of a given type shares the same properties, so the
+    property name->PropertyType mapping only needs to be probed once per
+    behaviour type and Cascadeur build. Dynamic behaviours aren't registered,
+    since their properties can differ per instance.
+    """
+    _schemas = {}
+
+
+    @staticmethod
+    def get_key(behaviour_name: str) -> tuple:
+        return (behaviour_name, _GIT_COUNT)
+
+
+    @staticmethod
+    def get(behaviour_name: str) -> BehaviourSchema | None:
+        """Returns the schema of a behaviour type, or None if unknown"""
+        return BehaviourSchemaRegistry._schemas.get(BehaviourSchemaRegistry.get_key(behaviour_name))
+
+
+    @staticmethod
+    def register(behaviour_name: str, schema: BehaviourSchema):
+        """Store the schema shared by all behaviours of the given type"""
+        BehaviourSchemaRegistry._schemas[BehaviourSchemaRegistry.get_key(behaviour_name)] = schema
+
+
+    @staticmethod
+    def clear():
+        """Forget all registered behaviour types"""
+        BehaviourSchemaRegistry._schemas.clear()
+
+
+
 class PyBehaviour(PyGuid):
     """A wrapper for Cascadeur Behaviours"""
-    
+
+    @instrumentation.instrument('PyBehaviour.__init__')
     def __init__(self, *args, **kwargs):
         super(PyBehaviour, self).__init__(*args, **kwargs)
         self._init = False
         self._name = self.get_name()
         self.is_dynamic = self._name.startswith('Dynamic')
-        self._property_types = {name:self._get_property_type(name) for name in self.get_property_names()}
+        self._schema = self._get_schema()
+        if not LAZY_PROPERTY_TYPES:
+            self._resolve_property_types()
+
         self._init = True
 
          
@@ -1069,7 +2420,7 @@ class PyBehaviour(PyGuid):
     
     
     def _get_property_type(self, name):
-        """Used to build the internal self._property_types mapping"""
+        """Probes the api to find the PropertyType of the given property"""
         try:
             self.get_data(name)
             return PropertyType.DATA
@@ -1128,18 +2479,52 @@ class PyBehaviour(PyGuid):
             raise PropertyError(self.name, name)
         else:
             return PropertyType.UNKNOWN
-    
-        
-    
+
+
+    def _get_schema(self) -> BehaviourSchema:
+        """Returns the BehaviourSchema describing this behaviour's properties
+
+        The schema of non-dynamic behaviours is shared through the
+        BehaviourSchemaRegistry, so only the first behaviour of each type
+        queries the api.
+        """
+        if self.is_dynamic:
+            return BehaviourSchema(self.get_property_names())
+
+        schema = BehaviourSchemaRegistry.get(self._name)
+        if schema is None:
+            schema = BehaviourSchema(self.get_property_names())
+            BehaviourSchemaRegistry.register(self._name, schema)
+
+        return schema
+
+
+    def _resolve_property_types(self):
+        """Probe the type of every property that hasn't been resolved yet"""
+        property_types = self._schema.property_types
+        for name, property_type in property_types.items():
+            if property_type is None:
+                property_types[name] = self._get_property_type(name)
+
+
     def get_property_type(self, name) -> PropertyType | None:
-        """Return the type of data a behaviour property maps to"""
-        
-        if name not in self._property_types:
+        """Return the type of data a behaviour property maps to
+
+        When LAZY_PROPERTY_TYPES is True the type is probed the first time
+        the property is requested and remembered afterwards.
+        """
+        property_types = self._schema.property_types
+        if name not in property_types:
             return None
-        
-        return self._property_types[name]
-    
-    
+
+        property_type = property_types[name]
+        if property_type is None:
+            property_type = self._get_property_type(name)
+            property_types[name] = property_type
+
+        return property_type
+
+
     def get_siblings_by_name(self, behaviour_name: str):
         """alias for self.object.get_behaviours_by_name"""
         return self.object.get_behaviours_by_name(behaviour_name)
@@ -1202,102 +2587,126 @@ class PyBehaviour(PyGuid):
         return self.beh_viewer.get_behaviour_property_names(self)
     
 #----wrapped behaviour editor functions----------------------
-    def _run_edit(self, func: str, *args, **kwargs):
+    #PyBehaviour editor operations -> the BehaviourEditor method they call.
+    #Every method takes the behaviour as its first argument.
+    EDITOR_METHODS = {
+        'add_data_to_range': 'add_behaviour_data_to_range',
+        'add_model_object_to_range': 'add_behaviour_model_object_to_range',
+        'add_reference_to_range': 'add_behaviour_reference_to_range',
+        'add_setting_to_range': 'add_behaviour_setting_to_range',
+        'delete_self': 'delete_behaviour',
+        'erase_data_from_range': 'erase_behaviour_data_from_range',
+        'erase_model_object_from_range': 'erase_behaviour_model_object_from_range',
+        'erase_reference_from_range': 'erase_behaviour_reference_from_range',
+        'erase_setting_from_range': 'erase_behaviour_setting_from_range',
+        'hide': 'hide_behaviour',
+        'set_data': 'set_behaviour_data',
+        'set_data_to_range': 'set_behaviour_data_to_range',
+        'set_model_object': 'set_behaviour_model_object',
+        'set_model_objects_to_range': 'set_behaviour_model_objects_to_range',
+        'set_reference': 'set_behaviour_reference',
+        'set_references_to_range': 'set_behaviour_references_to_range',
+        'set_setting': 'set_behaviour_setting',
+        'set_settings_to_range': 'set_behaviour_settings_to_range',
+        'set_string': 'set_behaviour_string',
+        'set_field_value': 'set_behaviour_field_value',
+    }
+    
+    #EDITOR_METHODS operations that only set values, unless they target the
+    #behaviourName. The others can change the hierarchy, references or the
+    #behaviours of an object.
+    DATA_OPERATIONS = frozenset([
+        'add_data_to_range', 'add_setting_to_range', 'erase_data_from_range', 'erase_setting_from_range',
+        'hide', 'set_data', 'set_data_to_range', 'set_setting', 'set_settings_to_range', 'set_string',
+        'set_field_value',
+    ])
+    
+    @staticmethod
+    def is_data_operation(operation: str, args: tuple) -> bool:
+        """True if the operation can't invalidate the scene indexes, see PyScene.generation"""
+        if operation not in PyBehaviour.DATA_OPERATIONS:
+            return False
+        
+        return not args or args[0] != 'behaviourName'
+    
+    
+    def _run_edit(self, operation: str, *args, **kwargs):
         result = None
         def _behaviour_edit():
-            nonlocal result, func, self
+            nonlocal result
             
-            #editor methods can't be accessed ahead of the edit(), so we need
-            #to convert a string representation into the real func, now that
-            #the editor is accessible.
-            func = eval(func)
-
-            result = func(*args, **kwargs)
+            #editor methods can't be accessed ahead of the edit(), so the
+            #operation is resolved now that the editor is accessible.
+            func = self.scene._get_behaviour_editor_method(operation)
+            result = func(self, *args, **kwargs)
             
-        self.scene.edit('behaviour edit', _behaviour_edit, _internal_edit=True) #func.__name__
+        self.scene.edit('behaviour edit', _behaviour_edit, _internal_edit=True,
+                        _data_only=PyBehaviour.is_data_operation(operation, args))
         return result
 
     def add_data_to_range(self, prop_name, data_id):
-        func =  'self.beh_editor.add_behaviour_data_to_range'
-        return self._run_edit(func, self, prop_name, data_id)
+        return self._run_edit('add_data_to_range', prop_name, data_id)
     
     def add_model_object_to_range(self, prop_name, model_id):
-        func =  'self.beh_editor.add_behaviour_model_object_to_range'
-        return self._run_edit(func, self, prop_name, model_id)
+        return self._run_edit('add_model_object_to_range', prop_name, model_id)
   
     def add_reference_to_range(self, prop_name, ref_id):
-        func =  'self.beh_editor.add_behaviour_reference_to_range'
-        return self._run_edit(func, self, prop_name, ref_id)
+        return self._run_edit('add_reference_to_range', prop_name, ref_id)
     
     def add_setting_to_range(self, prop_name, setting_id):
-        func =  'self.beh_editor.add_behaviour_setting_to_range'
-        return self._run_edit(func, self, prop_name, setting_id)
+        return self._run_edit('add_setting_to_range', prop_name, setting_id)
     
     def delete_self(self):
-        func = 'self.beh_editor.delete_behaviour'
-        result = self._run_edit(func, self)
-        self.object.flush_cache()
+        #the owner can't be looked up once the behaviour is gone
+        owner = self.object
+        result = self._run_edit('delete_self')
+        owner.flush_cache()
         return result
         
     def erase_data_from_range(self, prop_name, data_id):
-        func =  'self.beh_editor.erase_behaviour_data_from_range'
-        return self._run_edit(func, self, prop_name, data_id)
+        return self._run_edit('erase_data_from_range', prop_name, data_id)
     
     def erase_model_object_from_range(self, prop_name, model_id):
-        func =  'self.beh_editor.erase_behaviour_model_object_from_range'
-        return self._run_edit(func, self, prop_name, model_id)
+        return self._run_edit('erase_model_object_from_range', prop_name, model_id)
   
     def erase_reference_from_range(self, prop_name, ref_id):
-        func =  'self.beh_editor.erase_behaviour_reference_from_range'
-        return self._run_edit(func, self, prop_name, ref_id)
+        return self._run_edit('erase_reference_from_range', prop_name, ref_id)
     
     def erase_setting_from_range(self, prop_name, setting_id):
-        func =  'self.beh_editor.erase_behaviour_setting_from_range'
-        return self._run_edit(func, self, prop_name, setting_id)
+        return self._run_edit('erase_setting_from_range', prop_name, setting_id)
     
     def hide(self, hidden=True):
-        func =  'self.beh_editor.hide_behaviour'
-        return self._run_edit(func, self, hidden)
+        return self._run_edit('hide', hidden)
     
     def set_data(self, prop_name, data_id):
-        func =  'self.beh_editor.set_behaviour_data'
-        return self._run_edit(func, self, prop_name, data_id)
+        return self._run_edit('set_data', prop_name, data_id)
     
     def set_data_to_range(self, prop_name, inserted_ids: typing.List[csc.model.DataId]):
-        func =  'self.beh_editor.set_behaviour_data_to_range'
-        return self._run_edit(func, self, prop_name, inserted_ids) 
+        return self._run_edit('set_data_to_range', prop_name, inserted_ids) 
     
     def set_model_object(self, prop_name, model_id):
-        func =  'self.beh_editor.set_behaviour_model_object'
-        return self._run_edit(func, self, prop_name, model_id)
+        return self._run_edit('set_model_object', prop_name, model_id)
     
     def set_model_objects_to_range(self, prop_name, inserted_ids: typing.List[csc.model.ObjectId]):
-        func =  'self.beh_editor.set_behaviour_model_objects_to_range'
-        return self._run_edit(func, self, prop_name, inserted_ids)  
+        return self._run_edit('set_model_objects_to_range', prop_name, inserted_ids)  
   
     def set_reference(self, prop_name, ref_id):
-        func =  'self.beh_editor.set_behaviour_reference'
-        return self._run_edit(func, self, prop_name, ref_id)
+        return self._run_edit('set_reference', prop_name, ref_id)
     
     def set_references_to_range(self, prop_name, inserted_ids: typing.List[csc.model.Guid]):
-        func =  'self.beh_editor.set_behaviour_references_to_range'
-        return self._run_edit(func, self, prop_name, inserted_ids)
+        return self._run_edit('set_references_to_range', prop_name, inserted_ids)
     
     def set_setting(self, prop_name, setting_id):
-        func =  'self.beh_editor.set_behaviour_setting'
-        return self._run_edit(func, self, prop_name, setting_id)
+        return self._run_edit('set_setting', prop_name, setting_id)
     
     def set_settings_to_range(self, prop_name, setting_id):
-        func =  'self.beh_editor.set_behaviour_settings_to_range'
-        return self._run_edit(func, self, prop_name, setting_id)
+        return self._run_edit('set_settings_to_range', prop_name, setting_id)
     
     def set_string(self, prop_name: str, value: str):
-        func =  'self.beh_editor.set_behaviour_string'
-        return self._run_edit(func, self, prop_name, value)
+        return self._run_edit('set_string', prop_name, value)
     
     def set_field_value(self, prop_name: str, value: str):
-        func = 'self.beh_editor.set_behaviour_field_value'
-        return self._run_edit(func, self, prop_name, value)
+        return self._run_edit('set_field_value', prop_name, value)
         
 
 
@@ -1351,7 +2760,126 @@ class StringProperty(Property):
     
   
   
-class DataProperty(Property):
+class AnimatableProperty(Property):
+    """Base class for properties whose values can be animated over frames"""
+    
+    def _get_id(self):
+        raise NotImplementedError
+    
+    
+    def _is_animateable(self, item_id):
+        raise NotImplementedError
+    
+    
+    def _get_value_reader(self) -> typing.Callable:
+        """Returns the unwrapped viewer method used to read values"""
+        raise NotImplementedError
+    
+    
+    def _get_value_writer(self) -> typing.Callable:
+        """Returns the unwrapped editor method used to write values
+        
+        This will only be valid during the call to self.scene.edit()
+        """
+        raise NotImplementedError
+    
+    
+    def _get_raw_id(self):
+        item_id = self._get_id()
+        if isinstance(item_id, CscWrapper):
+            item_id = item_id.unwrap()
+            
+        return item_id
+    
+    
+    def get_range(self, start: int, end: int, step: int=1):
+        """Returns the values from start to end (inclusive) as one array
+        
+        See get_frames() for details.
+        """
+        return self.get_frames(range(start, end + 1, step))
+    
+    
+    @instrumentation.instrument('AnimatableProperty.get_frames')
+    def get_frames(self, frames: typing.Iterable[int]):
+        """Returns the values of the given frames as one contiguous array
+        
+        The mode is only checked once and values are read straight from the
+        DataViewer, which is much faster than calling get() for each frame.
+        Each row holds the components of one frame, so reading a vector over
+        100 frames returns a (100, 3) array.
+        
+        Returns:
+            numpy.ndarray: Shaped (frames, components)
+            array.array: When numpy is missing, the same values flattened row
+            by row.
+            None: When the property has no data assigned
+        """
+        item_id = self._get_raw_id()
+        if item_id is None:
+            return None
+        
+        if not isinstance(frames, (list, tuple, range)):
+            frames = list(frames)
+            
+        read_value = instrumentation.track_call(self._get_value_reader())
+        if self._is_animateable(item_id):
+            return _read_frame_array(read_value, item_id, frames)
+        
+        value = read_value(item_id)
+        return _to_frame_array((value for frame in frames), len(frames))
+    
+    
+    @instrumentation.instrument('AnimatableProperty.set_many')
+    def set_many(self, frames: typing.Iterable[int] | typing.Mapping, values: typing.Iterable=None):
+        """Set a different value on each frame inside a single edit
+        
+        Args:
+            frames: The frames to set, or a frame->value mapping when no
+            values are given.
+            values: One value per frame. The result of get_frames() can be
+            passed back in: the rows of a (frames, components) array, or the
+            flat array.array returned when numpy is missing, which is split
+            into one row per frame.
+        
+        raises:
+            ValueError: If the property isn't animated or the number of
+            frames and values don't match.
+        """
+        if values is None:
+            values = list(frames.values())
+            frames = list(frames.keys())
+        else:
+            frames = list(frames)
+            if isinstance(values, array.array):
+                if len(frames) == 0 and len(values) == 0:
+                    return
+                
+                values = _to_rows(values, len(frames))
+            elif not hasattr(values, '__len__'):
+                values = list(values)
+                
+            if len(frames) != len(values):
+                raise ValueError("set_many got {} frames, but {} values".format(len(frames), len(values)))
+            
+        item_id = self._get_raw_id()
+        if item_id is None:
+            return
+        
+        if not self._is_animateable(item_id):
+            raise ValueError("{}.{} isn't animated, so it can't hold a value per frame".format(self.behaviour.name, self.name))
+        
+        def _set_many():
+            write_value = instrumentation.track_call(self._get_value_writer())
+            for frame, value in zip(frames, values):
+                write_value(item_id, int(frame), _from_components(value))
+                
+        self.scene.edit('Set {} Frames'.format(self.name), _set_many, _internal_edit=True,
+                        _data_only=self.name != 'behaviourName')
+    
+    
+    
+class DataProperty(AnimatableProperty):
     """Represents behaviour.properties that == csc.model.DataId(s)"""
 
                 
@@ -1359,7 +2887,11 @@ class DataProperty(Property):
         if data_id is None:
             raise (Exception("{}.{} has no data assigned").format(self.behaviour.name, self.name))
         
-        return self.dat_viewer.get_data(data_id).mode == csc.model.DataMode.Animation
+        if isinstance(data_id, CscWrapper):
+            data_id = data_id.unwrap()
+            
+        #compare unwrapped values, a wrapped mode never equals the csc enum
+        return self.dat_viewer.unwrap().get_data(data_id).mode == csc.model.DataMode.Animation
         
         
     def _get_id(self):
@@ -1368,6 +2900,14 @@ class DataProperty(Property):
             data_id = self.behaviour.get_data(self.name)
             
         return data_id
+    
+    
+    def _get_value_reader(self):
+        return self.dat_viewer.unwrap().get_data_value
+    
+    
+    def _get_value_writer(self):
+        return self.dat_editor.unwrap().set_data_value
 
              
     def is_animateable(self):
@@ -1385,7 +2925,7 @@ class DataProperty(Property):
         
         elif self._is_animateable(data_id):
             if frame is None:
-                frame = self.domain_scene.get_current_frame()
+                frame = self.dom_scene.get_current_frame()
                 
             return self.dat_viewer.get_data_value(data_id, frame) 
         else:
@@ -1400,17 +2940,19 @@ class DataProperty(Property):
         
         def _set_data():   
             if self._is_animateable(data_id):
-                if frame is None and frames is None:
-                    frame = self.domain_scene.get_current_frame()
+                target_frame = frame
+                if target_frame is None and frames is None:
+                    target_frame = self.dom_scene.get_current_frame()
                     
-                if frame:
-                    self.dat_editor.set_data_value (data_id, frame, value)
+                if target_frame is not None:
+                    self.dat_editor.set_data_value (data_id, target_frame, value)
                 else:
                     self.dat_editor.set_data_value(data_id, frames, value)
             else:
                 self.dat_editor.set_data_value(data_id, value)
             
-        self.scene.edit('Set Data', _set_data, _internal_edit=True)
+        #the behaviourName data holds the name of a Dynamic behaviour
+        self.scene.edit('Set Data', _set_data, _internal_edit=True, _data_only=self.name != 'behaviourName')
         
         
     def get_default_value(self):
@@ -1418,7 +2960,11 @@ class DataProperty(Property):
     
     
     def create_data(self, name: str, mode: csc.model.DataMode, value, data_id=None, group_name=None):
-        """Creates a new csc.model.Data and assign it to the property"""
+        """Creates a new csc.model.Data and assign it to the property
+        
+        Returns False inside a PyScene.transaction(), where the edit is queued.
+        """
+        self.scene._warn_queued_result('DataProperty.create_data')
         added = False
         def _property_create_data():
             nonlocal added
@@ -1432,14 +2978,17 @@ class DataProperty(Property):
 
         
         
-class SettingProperty(Property):
+class SettingProperty(AnimatableProperty):
     """Represents behaviour.properties that == csc.model.SettingId(s)"""
              
     def _is_animateable(self, setting_id):
         if setting_id is None:
             raise (Exception("{}.{} has no settings data assigned").format(self.behaviour.name, self.name))
         
-        return self.dat_viewer.get_setting(setting_id).mode == csc.model.SettingMode.Animation
+        if isinstance(setting_id, CscWrapper):
+            setting_id = setting_id.unwrap()
+            
+        return self.dat_viewer.unwrap().get_setting(setting_id).mode == csc.model.SettingMode.Animation
         
         
     def _get_id(self):
@@ -1450,6 +2999,14 @@ class SettingProperty(Property):
             setting_id = self.behaviour.get_setting(self.name)
             
         return setting_id
+    
+    
+    def _get_value_reader(self):
+        return self.dat_viewer.unwrap().get_setting_value
+    
+    
+    def _get_value_writer(self):
+        return self.dat_editor.unwrap().set_setting_value
   
   
     def is_animateable(self):
@@ -1464,31 +3021,32 @@ class SettingProperty(Property):
         
         if self._is_animateable(setting_id):
             if frame is None:
-                frame = self.domain_scene.get_current_frame()
+                frame = self.dom_scene.get_current_frame()
                 
-            return self.dat_viewer.get_setting_value(self, frame) 
+            return self.dat_viewer.get_setting_value(setting_id, frame) 
         else:
-            return self.dat_viewer.get_setting_value(self)
+            return self.dat_viewer.get_setting_value(setting_id)
         
         
-    def set(self, value, frame=None, frames=typing.Set[int] | None):
+    def set(self, value, frame=None, frames: typing.Set[int] | None=None):
         setting_id = self._get_id()
         if setting_id is None:
             return            
         
         def _set_setting():
             if self._is_animateable(setting_id):
-                if frame is None and frames is None:
-                    frame = self.domain_scene.get_current_frame()
+                target_frame = frame
+                if target_frame is None and frames is None:
+                    target_frame = self.dom_scene.get_current_frame()
                     
-                if frame:
-                    self.dat_editor.set_setting_value(setting_id, frame, value)
+                if target_frame is not None:
+                    self.dat_editor.set_setting_value(setting_id, target_frame, value)
                 else:
                     self.dat_editor.set_setting_value(setting_id, frames, value)
             else:
                 self.dat_editor.set_setting_value(setting_id, value)
                 
-        self.scene.edit('Set Setting', _set_setting, _internal_edit=True)
+        self.scene.edit('Set Setting', _set_setting, _internal_edit=True, _data_only=True)
         
         
         
@@ -1503,7 +3061,7 @@ class ObjectProperty(Property):
         if object_id is None:
             return None  
         else:
-            return PyObject(object_id, self.scene) 
+            return self.scene._get_wrapper(PyObject, object_id, self.scene)
         
 
     def set(self, value: PyObject|None):
@@ -1530,7 +3088,7 @@ class ReferenceProperty(Property):
             #return [self.__get(value) for value in content]
         else:
             behaviour_owner = self.behaviour.beh_viewer.get_behaviour_owner(behaviour_id)
-            return PyBehaviour(behaviour_id, behaviour_owner)
+            return self.scene._get_wrapper(PyBehaviour, behaviour_id, behaviour_owner)
         
 
     def set(self, value: PyBehaviour|None):
@@ -1613,7 +3171,11 @@ class DataRange(PropertyRange):
         self.behaviour.erase_data_from_range(self.name, element)
     
     def create_data(self, name: str, mode: csc.model.DataMode, value, data_id=None, group_name=None):
-        """Creates a new csc.model.Data and assign it to the property"""
+        """Creates a new csc.model.Data and add it to the range
+        
+        Returns False inside a PyScene.transaction(), where the edit is queued.
+        """
+        self.scene._warn_queued_result('DataRange.create_data')
         added = False
         def _create_data():
             nonlocal added
@@ -1647,7 +3209,11 @@ class SettingRange(PropertyRange):
         self.behaviour.erase_setting_from_range(self.name, element)
     
     def create_setting(self, name: str, mode: csc.model.SettingMode, value, setting_id=None, group_name=None):
-        """Creates a new csc.model.Data and assign it to the property"""
+        """Creates a new csc.model.Setting and add it to the range
+        
+        Returns False inside a PyScene.transaction(), where the edit is queued.
+        """
+        self.scene._warn_queued_result('SettingRange.create_setting')
         added = False
         def _create_data():
             nonlocal added
@@ -1668,7 +3234,7 @@ class ReferenceRange(PropertyRange):
     
     def _wrap_item(self, item) -> PyBehaviour:
         behaviour_owner = self.beh_viewer.get_behaviour_owner(item)
-        return PyBehaviour(item, behaviour_owner)
+        return self.scene._get_wrapper(PyBehaviour, item, behaviour_owner)
     
     def set(self, item_list: list):
         self.behaviour.set_references_to_range(self.name, item_list)
@@ -1686,7 +3252,7 @@ class ObjectRange(PropertyRange):
         return self.behaviour.get_objects_range(self.name)
     
     def _wrap_item(self, item) -> PyBehaviour:
-        return PyObject(item, self.scene)
+        return self.scene._get_wrapper(PyObject, item, self.scene)
     
     def set(self, item_list: typing.List[PyObject]):
         self.behaviour.set_model_objects_to_range(self.name, item_list)
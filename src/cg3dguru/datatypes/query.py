@@ -0,0 +1,641 @@
+"""Composable, planned queries over the objects of a PyScene
+
+Built by PyScene.query(). For example:
+
+scene.query().type('Joint').name_matches('^L_').has_behaviour('Dynamic').all()
+
+Each filter is a QueryStep. When a SceneQuery runs, its steps are planned
+into a QueryPlan using the scene indexes of cg3dguru.datatypes.core.
+"""
+from __future__ import annotations #used so I don't have to forward declare classes for type hints
+
+import itertools
+import re
+import typing
+
+import csc
+
+from .. import instrumentation
+from .core import CscWrapper, PyScene, PyObject, SceneIndex, NameIndex, TypeIndex, HierarchyIndex, BehaviourIndex
+
+
+
+class QueryContext(object):
+    """The scene data shared by the steps of a SceneQuery while it's planned and run"""
+    
+    def __init__(self, scene: PyScene):
+        self.scene = scene
+        self.model_viewer = instrumentation.track(scene.mv.unwrap())
+        self.behaviour_viewer = instrumentation.track(scene.bv.unwrap())
+        self._object_ids = None
+        self._selected_ids = None
+        #the index the source of the plan being estimated will build
+        self.planned_index = None
+        
+        
+    def get_index(self, index_class) -> SceneIndex | None:
+        """Returns the index if it's already built, else None"""
+        return self.scene._get_built_index(index_class)
+    
+    
+    def has_index(self, index_class) -> bool:
+        """True if the index is built, or will be by the source of the plan"""
+        return index_class == self.planned_index or self.scene._get_built_index(index_class) is not None
+    
+    
+    @property
+    def object_ids(self) -> typing.List[csc.model.ObjectId]:
+        if self._object_ids is None:
+            self._object_ids = self.model_viewer.get_objects()
+            
+        return self._object_ids
+    
+    
+    @property
+    def object_count(self) -> int:
+        """The number of objects in the scene, read from an index when possible"""
+        if self._object_ids is None:
+            hierarchy = self.get_index(HierarchyIndex)
+            if hierarchy is not None:
+                return len(hierarchy)
+            
+        return len(self.object_ids)
+    
+    
+    @property
+    def selected_ids(self) -> typing.Set[csc.model.ObjectId]:
+        if self._selected_ids is None:
+            self._selected_ids = set(self.scene.dom_scene.selector().selected().unwrap().ids)
+            
+        return self._selected_ids
+    
+    
+    def wrap(self, object_id: csc.model.ObjectId) -> PyObject:
+        return self.scene.mv._wrap(object_id)
+    
+    
+    
+class QueryStep(object):
+    """A single filter of a SceneQuery
+    
+    Steps backed by an index can also be the source of a query, producing
+    the candidates the other steps filter. Costs are estimated in api calls.
+    """
+    
+    #The index the step reads from, None if it only uses the api
+    index_class = None
+    #api calls per scene object needed to build the index
+    build_cost = 1
+    #api calls needed to check one object without the index
+    check_cost = 1
+    #The fraction of the scene the step is expected to keep, when it can't
+    #be counted from a built index
+    selectivity = 0.5
+    
+    def describe(self) -> str:
+        raise NotImplementedError
+    
+    
+    def uses_index(self, context: QueryContext) -> bool:
+        return self.index_class is not None and context.has_index(self.index_class)
+    
+    
+    def estimate_count(self, context: QueryContext) -> float:
+        """The estimated number of scene objects the step keeps"""
+        return context.object_count * self.selectivity
+    
+    
+    def source_cost(self, context: QueryContext) -> float | None:
+        """The cost of producing the candidates, None if the step can't"""
+        if self.index_class is None:
+            return None
+        
+        if context.get_index(self.index_class) is not None:
+            return 0
+        
+        return context.object_count * self.build_cost
+    
+    
+    def iter_source(self, context: QueryContext) -> typing.Iterable[csc.model.ObjectId]:
+        raise NotImplementedError
+    
+    
+    def filter_cost(self, context: QueryContext) -> float:
+        """The cost of checking a single candidate"""
+        return 0 if self.uses_index(context) else self.check_cost
+    
+    
+    def make_filter(self, context: QueryContext) -> typing.Callable[[csc.model.ObjectId], bool]:
+        raise NotImplementedError
+    
+    
+    
+class ScanStep(QueryStep):
+    """The fallback source, every object of the scene"""
+    
+    def describe(self):
+        return 'every object'
+    
+    
+    def estimate_count(self, context):
+        return context.object_count
+    
+    
+    def source_cost(self, context):
+        return 1
+    
+    
+    def iter_source(self, context):
+        return context.object_ids
+    
+    
+    
+class TypeStep(QueryStep):
+    index_class = TypeIndex
+    selectivity = 0.25
+    
+    def __init__(self, type_names: typing.Tuple[str]):
+        #repeated names would list their objects more than once
+        self.type_names = tuple(dict.fromkeys(type_names))
+        
+        
+    def describe(self):
+        return 'type in {}'.format(self.type_names)
+    
+    
+    def estimate_count(self, context):
+        type_index = context.get_index(TypeIndex)
+        if type_index is None:
+            return super(TypeStep, self).estimate_count(context)
+        
+        counts = type_index.count_by_type()
+        return sum(counts.get(type_name, 0) for type_name in self.type_names)
+    
+    
+    def iter_source(self, context):
+        type_index = context.scene.get_type_index()
+        return itertools.chain.from_iterable(type_index.get(type_name) for type_name in self.type_names)
+    
+    
+    def make_filter(self, context):
+        type_names = set(self.type_names)
+        type_index = context.get_index(TypeIndex)
+        if type_index is not None:
+            return lambda object_id: type_index.get_type_name(object_id) in type_names
+        
+        model_viewer = context.model_viewer
+        return lambda object_id: model_viewer.get_object_type_name(object_id) in type_names
+    
+    
+    
+class NameStep(QueryStep):
+    index_class = NameIndex
+    
+    def __init__(self, name: str):
+        self.name = name
+        
+        
+    def describe(self):
+        return 'name == {!r}'.format(self.name)
+    
+    
+    def estimate_count(self, context):
+        name_index = context.get_index(NameIndex)
+        if name_index is None:
+            return 1
+        
+        return len(name_index.get(self.name))
+    
+    
+    def iter_source(self, context):
+        return context.scene.get_name_index().get(self.name)
+    
+    
+    def _matches(self, name: str) -> bool:
+        return name == self.name
+    
+    
+    def make_filter(self, context):
+        name_index = context.get_index(NameIndex)
+        if name_index is not None:
+            return lambda object_id: self._matches(name_index.get_name(object_id))
+        
+        model_viewer = context.model_viewer
+        return lambda object_id: self._matches(model_viewer.get_object_name(object_id))
+    
+    
+    
+class NamePrefixStep(NameStep):
+    selectivity = 0.1
+    
+    def describe(self):
+        return 'name starts with {!r}'.format(self.name)
+    
+    
+    def estimate_count(self, context):
+        name_index = context.get_index(NameIndex)
+        if name_index is None:
+            return QueryStep.estimate_count(self, context)
+        
+        return len(name_index.get_prefixed(self.name))
+    
+    
+    def iter_source(self, context):
+        return context.scene.get_name_index().get_prefixed(self.name)
+    
+    
+    def _matches(self, name):
+        return name is not None and name.startswith(self.name)
+    
+    
+    
+class NameMatchesStep(NameStep):
+    selectivity = 0.25
+    
+    def __init__(self, pattern: str):
+        super(NameMatchesStep, self).__init__(pattern)
+        self.regex = re.compile(pattern)
+        
+        
+    def describe(self):
+        return 'name matches {!r}'.format(self.name)
+    
+    
+    def estimate_count(self, context):
+        name_index = context.get_index(NameIndex)
+        if name_index is None:
+            return QueryStep.estimate_count(self, context)
+        
+        return len(name_index.get_matching(self.regex))
+    
+    
+    def source_cost(self, context):
+        #without the index every name has to be read anyway, so scanning the
+        #scene and filtering is just as cheap.
+        if context.get_index(NameIndex) is None:
+            return None
+        
+        return 0
+    
+    
+    def iter_source(self, context):
+        return context.scene.get_name_index().get_matching(self.regex)
+    
+    
+    def _matches(self, name):
+        return name is not None and self.regex.search(name) is not None
+    
+    
+    
+class BehaviourStep(QueryStep):
+    index_class = BehaviourIndex
+    #get_behaviours() plus get_behaviour_name() for each behaviour
+    build_cost = 5
+    check_cost = 5
+    selectivity = 0.25
+    
+    def __init__(self, behaviour_name: str):
+        self.behaviour_name = behaviour_name
+        
+        
+    def describe(self):
+        return 'has behaviour {!r}'.format(self.behaviour_name)
+    
+    
+    def estimate_count(self, context):
+        behaviour_index = context.get_index(BehaviourIndex)
+        if behaviour_index is None:
+            return super(BehaviourStep, self).estimate_count(context)
+        
+        return len(behaviour_index.get_owners(self.behaviour_name))
+    
+    
+    def iter_source(self, context):
+        return context.scene.get_behaviour_index().get_owners(self.behaviour_name)
+    
+    
+    def make_filter(self, context):
+        behaviour_index = context.get_index(BehaviourIndex)
+        if behaviour_index is not None:
+            return lambda object_id: behaviour_index.has_behaviour(object_id, self.behaviour_name)
+        
+        return lambda object_id: context.wrap(object_id).has_behaviour(self.behaviour_name)
+    
+    
+    
+class UnderStep(QueryStep):
+    index_class = HierarchyIndex
+    #each parent read looks up the Basic behaviour
+    build_cost = 3
+    #a few parent reads, up to the root
+    check_cost = 12
+    selectivity = 0.1
+    
+    def __init__(self, root: PyObject | csc.model.ObjectId):
+        self.root_id = root.unwrap() if isinstance(root, CscWrapper) else root
+        
+        
+    def describe(self):
+        return 'under {}'.format(self.root_id)
+    
+    
+    def estimate_count(self, context):
+        hierarchy = context.get_index(HierarchyIndex)
+        if hierarchy is None:
+            return super(UnderStep, self).estimate_count(context)
+        
+        return sum(1 for object_id in hierarchy.iter_descendants(self.root_id))
+    
+    
+    def iter_source(self, context):
+        return context.scene.get_hierarchy_index().iter_descendants(self.root_id)
+    
+    
+    def make_filter(self, context):
+        hierarchy = context.get_index(HierarchyIndex)
+        if hierarchy is not None:
+            return lambda object_id: any(parent_id == self.root_id for parent_id in hierarchy.iter_ancestors(object_id))
+        
+        behaviour_viewer = context.behaviour_viewer
+        def _is_under(object_id):
+            visited = set()
+            parent_id = HierarchyIndex.read_parent(behaviour_viewer, object_id)
+            while parent_id is not None and parent_id not in visited:
+                if parent_id == self.root_id:
+                    return True
+                
+                visited.add(parent_id)
+                parent_id = HierarchyIndex.read_parent(behaviour_viewer, parent_id)
+                
+            return False
+        
+        return _is_under
+    
+    
+    
+class RootsStep(QueryStep):
+    index_class = HierarchyIndex
+    build_cost = 3
+    check_cost = 3
+    selectivity = 0.1
+    
+    def describe(self):
+        return 'is a root'
+    
+    
+    def estimate_count(self, context):
+        hierarchy = context.get_index(HierarchyIndex)
+        if hierarchy is None:
+            return super(RootsStep, self).estimate_count(context)
+        
+        return len(hierarchy.get_roots())
+    
+    
+    def iter_source(self, context):
+        return context.scene.get_hierarchy_index().get_roots()
+    
+    
+    def make_filter(self, context):
+        hierarchy = context.get_index(HierarchyIndex)
+        if hierarchy is not None:
+            return lambda object_id: hierarchy.get_parent(object_id) is None
+        
+        behaviour_viewer = context.behaviour_viewer
+        return lambda object_id: HierarchyIndex.read_parent(behaviour_viewer, object_id) is None
+    
+    
+    
+class SelectedStep(QueryStep):
+    check_cost = 0
+    
+    def describe(self):
+        return 'is selected'
+    
+    
+    def estimate_count(self, context):
+        return len(context.selected_ids)
+    
+    
+    def source_cost(self, context):
+        return 1
+    
+    
+    def iter_source(self, context):
+        return context.selected_ids
+    
+    
+    def make_filter(self, context):
+        selected_ids = context.selected_ids
+        return lambda object_id: object_id in selected_ids
+    
+    
+    
+class WhereStep(QueryStep):
+    #a guess, the predicate can do anything
+    check_cost = 10
+    
+    def __init__(self, predicate: typing.Callable[[PyObject], bool]):
+        self.predicate = predicate
+        
+        
+    def describe(self):
+        return 'where {}'.format(getattr(self.predicate, '__name__', repr(self.predicate)))
+    
+    
+    def make_filter(self, context):
+        return lambda object_id: bool(self.predicate(context.wrap(object_id)))
+    
+    
+    
+class QueryPlan(object):
+    """The source and ordered filters a SceneQuery runs, with their estimated costs"""
+    
+    def __init__(self, source: QueryStep, filters: typing.List[QueryStep], context: QueryContext):
+        """Estimates the plan. context.planned_index must be the index the source builds"""
+        self.source = source
+        self.filters = filters
+        
+        #(step, how it reads the scene, cost, estimated objects left) for each step
+        self.estimates = []
+        count = source.estimate_count(context)
+        self.cost = source.source_cost(context)
+        self.estimates.append((source, QueryPlan._describe_access(source, context), self.cost, count))
+        
+        object_count = max(context.object_count, 1)
+        for step in filters:
+            step_cost = count * step.filter_cost(context)
+            self.cost += step_cost
+            count *= min(step.estimate_count(context) / object_count, 1.0)
+            self.estimates.append((step, QueryPlan._describe_access(step, context), step_cost, count))
+            
+        self.count = count
+        
+        
+    @staticmethod
+    def _describe_access(step: QueryStep, context: QueryContext) -> str:
+        if step.index_class is None:
+            return 'api'
+        
+        if context.get_index(step.index_class) is not None:
+            return '{} (built)'.format(step.index_class.__name__)
+        
+        if step.index_class == context.planned_index:
+            return '{} (build)'.format(step.index_class.__name__)
+        
+        return 'api, per object'
+        
+        
+    def explain(self) -> str:
+        lines = ['SceneQuery plan, estimated cost {:.0f} api calls, ~{:.0f} objects'.format(self.cost, self.count)]
+        for position, (step, access, cost, count) in enumerate(self.estimates):
+            role = 'source' if step is self.source else 'filter'
+            lines.append('  {}. {} {}: {}, cost {:.0f}, ~{:.0f} objects'.format(
+                position + 1, role, step.describe(), access, cost, count))
+            
+        return '\n'.join(lines)
+    
+    
+    
+class SceneQuery(object):
+    """Composable filters over the objects of a scene
+    
+    Each filter returns a new SceneQuery, so a query can be used as the base
+    of others. Nothing is read from the scene until the query is run with
+    all(), first(), count() or iterated. For example:
+    
+    scene.query().type('Joint').name_matches('^L_').has_behaviour('Dynamic').all()
+    
+    When run, the query is planned: the filter with the cheapest way of
+    producing candidates (a built index, the selection...) becomes the
+    source, and the other filters run on each candidate cheapest first. An
+    index that isn't built is only built when that's cheaper than checking
+    objects one by one. explain() shows the chosen plan.
+    """
+    
+    def __init__(self, scene: PyScene, steps: typing.Tuple[QueryStep]=()):
+        self.scene = scene
+        self._steps = tuple(steps)
+        
+        
+    def _add(self, step: QueryStep) -> SceneQuery:
+        return SceneQuery(self.scene, self._steps + (step,))
+    
+    
+    def type(self, *type_names: str) -> SceneQuery:
+        """Only objects matching any of the type names listed in the outliner"""
+        return self._add(TypeStep(type_names))
+    
+    
+    def name(self, name: str) -> SceneQuery:
+        """Only objects with the given name"""
+        return self._add(NameStep(name))
+    
+    
+    def name_prefix(self, prefix: str) -> SceneQuery:
+        """Only objects whose names start with prefix"""
+        return self._add(NamePrefixStep(prefix))
+    
+    
+    def name_matches(self, pattern: str) -> SceneQuery:
+        """Only objects whose names match the regular expression (re.search)"""
+        return self._add(NameMatchesStep(pattern))
+    
+    
+    def has_behaviour(self, behaviour_name: str) -> SceneQuery:
+        """Only objects holding the behaviour, see PyObject.has_behaviour()
+        
+        'Dynamic' matches every object holding a Dynamic behaviour, whatever
+        its behaviourName.
+        """
+        return self._add(BehaviourStep(behaviour_name))
+    
+    
+    def under(self, root: PyObject | csc.model.ObjectId) -> SceneQuery:
+        """Only the descendants of root"""
+        return self._add(UnderStep(root))
+    
+    
+    def roots(self) -> SceneQuery:
+        """Only objects without a parent"""
+        return self._add(RootsStep())
+    
+    
+    def selected(self) -> SceneQuery:
+        """Only selected objects"""
+        return self._add(SelectedStep())
+    
+    
+    def where(self, predicate: typing.Callable[[PyObject], bool]) -> SceneQuery:
+        """Only objects the predicate returns True for. Always checked last"""
+        return self._add(WhereStep(predicate))
+    
+    
+    def plan(self, context: QueryContext=None) -> QueryPlan:
+        """Returns the cheapest QueryPlan for the current scene state"""
+        if context is None:
+            context = QueryContext(self.scene)
+            
+        #ties go to index sources, the index is kept for later queries
+        sources = [step for step in self._steps if step.source_cost(context) is not None]
+        sources.append(ScanStep())
+        
+        object_count = max(context.object_count, 1)
+        best_plan = None
+        for source in sources:
+            context.planned_index = source.index_class
+            filters = [step for step in self._steps if step is not source]
+            
+            def _rank(step):
+                #classic filter ordering, cheap and selective filters first
+                kept = min(step.estimate_count(context) / object_count, 1.0)
+                return step.filter_cost(context) / max(1.0 - kept, 0.000001)
+            
+            filters.sort(key=_rank)
+            #arbitrary predicates run last, they may be expensive and can't be estimated
+            filters.sort(key=lambda step: isinstance(step, WhereStep))
+            plan = QueryPlan(source, filters, context)
+            if best_plan is None or plan.cost < best_plan.cost:
+                best_plan = plan
+                
+        context.planned_index = best_plan.source.index_class
+        return best_plan
+    
+    
+    def explain(self) -> str:
+        """Describe the plan the query would run, and its estimated cost"""
+        return self.plan().explain()
+    
+    
+    def _iter_ids(self) -> typing.Iterator[csc.model.ObjectId]:
+        context = QueryContext(self.scene)
+        plan = self.plan(context)
+        candidates = plan.source.iter_source(context)
+        #the filters are made after the source, so they can use an index it built
+        checks = [step.make_filter(context) for step in plan.filters]
+        for object_id in candidates:
+            if all(check(object_id) for check in checks):
+                yield object_id
+                
+                
+    def __iter__(self) -> typing.Iterator[PyObject]:
+        wrap = self.scene.mv._wrap
+        for object_id in self._iter_ids():
+            yield wrap(object_id)
+            
+            
+    @instrumentation.instrument('SceneQuery.all')
+    def all(self) -> typing.List[PyObject]:
+        """Returns every matching object"""
+        return list(self)
+    
+    
+    @instrumentation.instrument('SceneQuery.first')
+    def first(self) -> PyObject | None:
+        """Returns the first matching object, else None"""
+        return next(iter(self), None)
+    
+    
+    @instrumentation.instrument('SceneQuery.count')
+    def count(self) -> int:
+        """Returns the number of matching objects, without wrapping them"""
+        return sum(1 for object_id in self._iter_ids())
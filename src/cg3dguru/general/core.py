@@ -5,6 +5,14 @@ import csc
 
 import cg3dguru.datatypes
 
+
+#The csc.view.Scene and PyScene last handed out by new_scene/get_current_scene.
+#Only the wrapper and its viewers are reused, the scene data is flushed on each
+#hand out and close_scene() drops the entry.
+_cached_scene: tuple | None = None
+
+
+
 def new_scene() -> cg3dguru.datatypes.PyScene:
     """Creates a new scene and makes it the active scene
     
@@ -15,20 +23,85 @@ def new_scene() -> cg3dguru.datatypes.PyScene:
     application_scene = scene_manager.create_application_scene()
     scene_manager.set_current_scene(application_scene)
     
-    return cg3dguru.datatypes.PyScene.wrap(application_scene, None)
+    return _cache_scene(application_scene)
 
 
 
-def get_current_scene() -> cg3dguru.datatypes.PyScene:
-    """Get the current scene"""
+def get_current_scene(flush_cache: bool=True) -> cg3dguru.datatypes.PyScene:
+    """Get the current scene
+    
+    The PyScene is reused for as long as the scene stays current, so its
+    viewers and editors aren't fetched again. Its cached scene data (indexes
+    and behaviour caches) is flushed each time it's handed out, since the
+    scene may have been changed through the UI since the last call. Keep the
+    returned PyScene around to reuse that data between queries.
+    
+    Args:
+        flush_cache: Invalidate the cached scene data of the PyScene. Only
+        pass False when nothing but cg3dguru has edited the scene since the
+        last call.
+    """
     scene_manager = csc.app.get_application().get_scene_manager()
     scene = scene_manager.current_scene()
+    if _cached_scene is not None and _cached_scene[0] == scene:
+        py_scene = _cached_scene[1]
+        if flush_cache:
+            py_scene.flush_cache()
+            
+        return py_scene
+    
+    return _cache_scene(scene)
+
+
+
+def close_scene(scene: cg3dguru.datatypes.PyScene | csc.view.Scene):
+    """Close a scene, forgetting its cached PyScene
+    
+    Prefer this to closing the scene through the SceneManager, which leaves
+    the scene alive in the get_current_scene() cache.
+    """
+    if isinstance(scene, cg3dguru.datatypes.CscWrapper):
+        scene = scene.unwrap()
+        
+    scene_manager = csc.app.get_application().get_scene_manager()
+    scene_manager.close_scene(scene)
+    if _cached_scene is not None and _cached_scene[0] == scene:
+        clear_scene_cache()
+
+
+
+def clear_scene_cache():
+    """Forget the PyScene reused by get_current_scene
+    
+    The cache follows the current scene and close_scene() on its own. This is
+    only needed after a scene was closed by other means.
+    """
+    global _cached_scene
+    _cached_scene = None
+
+
+
+def _cache_scene(scene: csc.view.Scene) -> cg3dguru.datatypes.PyScene:
+    global _cached_scene
+    py_scene = cg3dguru.datatypes.PyScene.wrap(scene, None)
+    _cached_scene = (scene, py_scene)
     
-    return cg3dguru.datatypes.PyScene.wrap(scene, None)
+    return py_scene
 
 
 
 def get_scene_objects(names = [], selected = False, of_type = '', only_roots = False) -> typing.List[cg3dguru.datatypes.PyObject]:
     current_scene = get_current_scene()
     return current_scene.get_scene_objects(names, selected, of_type, only_roots)
+
+
+
+def iter_scene_objects(names: typing.Iterable[str]=(), selected: bool=False, of_type: str='', only_roots: bool=False,
+                       limit: int | None=None) -> typing.Iterator[cg3dguru.datatypes.PyObject]:
+    """Lazily yields the objects of the current scene matching the filters
+    
+    See PyScene.iter_scene_objects()
+    """
+    current_scene = get_current_scene()
+    return current_scene.iter_scene_objects(names, selected, of_type, only_roots, limit=limit)
     
\ No newline at end of file
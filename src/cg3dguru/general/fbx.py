@@ -1,7 +1,29 @@
+from __future__ import annotations #used so type hints are resolved after all content is read
 from enum import IntEnum
 from enum import auto
+import collections
+import concurrent.futures
+import os
+import re
+import struct
+import time
+import typing
+
 import csc
 from . import core
+from .. import instrumentation
+import cg3dguru.datatypes
+
+
+#Binary fbx files start with this, followed by 2 bytes and the uint32 version
+FBX_BINARY_MAGIC = b'Kaydara FBX Binary  \x00'
+#ASCII fbx files have a '; FBX 7.4.0 project file' comment near the top
+FBX_ASCII_VERSION = re.compile(rb';\s*FBX\s+(\d+)\.(\d+)\.(\d+)')
+#How much of an ASCII file is searched for the version comment
+FBX_ASCII_HEADER_SIZE = 1024
+#The default number of scenes import_fbx_batch() keeps open
+MAX_BATCH_SCENES = 8
+
 
 
 class FbxFilterType(IntEnum):
@@ -12,18 +34,35 @@ class FbxFilterType(IntEnum):
     ANIMATION = 4
     SELECTED = 5
     FRAMES = 6
+    
+    
+    
+#The FbxLoader method used by each import filter.
+#SELECTED imports animation to the selected objects and FRAMES to the active frames.
+_IMPORT_METHOD_NAMES = {
+    FbxFilterType.SCENE: 'import_scene',
+    FbxFilterType.MODEL: 'import_model',
+    FbxFilterType.ANIMATION: 'import_animation',
+    FbxFilterType.SELECTED: 'import_animation_to_selected_objects',
+    FbxFilterType.FRAMES: 'import_animation_to_selected_frames',
+}
 
 
 
-def current_fbx_loader() -> csc.fbx.FbxLoader:
+@instrumentation.instrument('fbx.current_fbx_loader')
+def current_fbx_loader(scene: cg3dguru.datatypes.PyScene=None) -> csc.fbx.FbxLoader:
     """Returns the FbxLoader for the current scene
     
     Use the returning object to export and import data. See
     https://cascadeur.com/python-api/_generate/csc.fbx.FbxLoader.html for
     more info.
+    
+    Args:
+        scene: The PyScene to get the loader for. Defaults to the current
+        scene.
     """
     
-    current_scene = core.get_current_scene()
+    current_scene = scene if scene is not None else core.get_current_scene()
     tools_manager = csc.app.get_application().get_tools_manager()
     fbx_scene_loader = tools_manager.get_tool("FbxSceneLoader").get_fbx_loader(current_scene.unwrap())
     
@@ -31,6 +70,7 @@ def current_fbx_loader() -> csc.fbx.FbxLoader:
 
     
     
+@instrumentation.instrument('fbx.import_fbx')
 def import_fbx(file_path: str, import_filter: FbxFilterType, new_scene: bool=False):
     """Import the fbx file into Cascadeur.
     
@@ -42,25 +82,12 @@ def import_fbx(file_path: str, import_filter: FbxFilterType, new_scene: bool=Fal
         core.new_scene()    
     
     loader = current_fbx_loader()
-    method = None
-    
-    if import_filter == FbxFilterType.SCENE:
-        method = loader.import_scene    
-    elif import_filter == FbxFilterType.MODEL:
-        method = loader.import_model
-    elif import_filter == FbxFilterType.ANIMATION:
-        method = loader.import_animation
-    elif import_filter == FbxFilterType.SELECTED:
-        method = loader.import_animation_to_selected_objects
-    elif import_filter == FbxFilterType.FRAMES:
-        method = loader.import_animation_to_selected_frames
-    else:
-        raise ValueError("Invalid import_filter value: {}".format(import_filter))
-        
-    method(file_path)
+    method = _get_import_method(loader, import_filter)
+    instrumentation.track_call(method)(file_path)
     
     
     
+@instrumentation.instrument('fbx.export_fbx')
 def export_fbx(file_path: str, export_filter: FbxFilterType):
     """Export an fbx file to the target file location
     
@@ -68,23 +95,265 @@ def export_fbx(file_path: str, export_filter: FbxFilterType):
     """
     
     loader = current_fbx_loader()
-    method = None
-
+    method = _get_export_method(loader, export_filter)
+    instrumentation.track_call(method)(file_path)
+    
+    
+    
+class FbxJobResult(object):
+    """The outcome of a single job of a batch import or export"""
+    
+    def __init__(self, file_path: str, fbx_filter: FbxFilterType):
+        self.file_path = file_path
+        self.fbx_filter = fbx_filter
+        #The time spent on the job in seconds
+        self.seconds = 0.0
+        #The exception raised by the job, if it failed
+        self.error: Exception | None = None
+        #What read_fbx_header() found, for batch imports
+        self.file_info: FbxFileInfo | None = None
+        
+        
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+    
+    
+    def __repr__(self):
+        state = 'ok' if self.succeeded else 'failed: {}'.format(self.error)
+        return '<FbxJobResult {} {:.3f}s {}>'.format(self.file_path, self.seconds, state)
+    
+    
+    
+@instrumentation.instrument('fbx.export_fbx_batch')
+def export_fbx_batch(jobs: typing.Iterable[tuple], stop_on_error: bool=False) -> typing.List[FbxJobResult]:
+    """Export many fbx files from the current scene
+    
+    The loader and its export methods are resolved once for the whole batch
+    and the selection is only changed when a job selects different objects
+    than the job before it. Jobs are run in the given order, so grouping jobs
+    that share a selection keeps the number of selection edits down.
+    
+    Args:
+        jobs: (objects, file_path, export_filter) tuples. objects are the
+        PyObjects or csc.model.ObjectIds to select before exporting. Use None
+        to export with the selection left as is.
+        stop_on_error: Stop at the first failing job instead of recording the
+        error and moving on to the next job.
+        
+    Returns:
+        A FbxJobResult per job run. The selection of the last job is kept.
+        
+    raises:
+        ValueError: If a job has an invalid export_filter. This is checked
+        before anything is exported.
+    """
+    jobs = list(jobs)
+    scene = core.get_current_scene()
+    loader = current_fbx_loader(scene)
+    
+    methods = {}
+    for objects, file_path, export_filter in jobs:
+        if export_filter not in methods:
+            methods[export_filter] = instrumentation.track_call(_get_export_method(loader, export_filter))
+    
+    results = []
+    selected_ids = None
+    for objects, file_path, export_filter in jobs:
+        result = FbxJobResult(file_path, export_filter)
+        results.append(result)
+        start = time.perf_counter()
+        try:
+            if objects is not None:
+                object_ids = frozenset(cg3dguru.datatypes.CscWrapper.unwrap_list(list(objects)))
+                if object_ids != selected_ids:
+                    scene.select(list(object_ids))
+                    selected_ids = object_ids
+                
+            methods[export_filter](file_path)
+        except Exception as e:
+            result.error = e
+            #the selection can't be trusted after a failure
+            selected_ids = None
+        finally:
+            result.seconds = time.perf_counter() - start
+            
+        if stop_on_error and result.error is not None:
+            break
+            
+    return results
+    
+    
+    
+class FbxFileInfo(object):
+    """The size and header details of an fbx file"""
+    
+    def __init__(self, file_path: str, size: int, is_binary: bool, version: int):
+        self.file_path = file_path
+        self.size = size
+        self.is_binary = is_binary
+        #The fbx version as an int, 7400 for 7.4.0
+        self.version = version
+        
+        
+    def __repr__(self):
+        return '<FbxFileInfo {} {} bytes {} {}>'.format(
+            self.file_path, self.size, 'binary' if self.is_binary else 'ascii', self.version)
+    
+    
+    
+def read_fbx_header(file_path: str) -> FbxFileInfo:
+    """Validate the header of an fbx file without loading it
+    
+    Only the first bytes of the file are read, so this is cheap enough to run
+    on many files and safe to run off the main thread.
+    
+    raises:
+        OSError: If the file can't be read
+        ValueError: If the file is empty or isn't a binary or ASCII fbx file
+    """
+    size = os.stat(file_path).st_size
+    if size == 0:
+        raise ValueError("{} is empty".format(file_path))
+    
+    with open(file_path, 'rb') as handle:
+        header = handle.read(max(FBX_ASCII_HEADER_SIZE, len(FBX_BINARY_MAGIC) + 6))
+        
+    if header.startswith(FBX_BINARY_MAGIC):
+        start = len(FBX_BINARY_MAGIC) + 2
+        if len(header) < start + 4:
+            raise ValueError("{} has a truncated fbx header".format(file_path))
+        
+        version = struct.unpack_from('<I', header, start)[0]
+        return FbxFileInfo(file_path, size, True, version)
+    
+    match = FBX_ASCII_VERSION.search(header)
+    if match is None:
+        raise ValueError("{} isn't an fbx file".format(file_path))
+    
+    major, minor, patch = (int(value) for value in match.groups())
+    return FbxFileInfo(file_path, size, False, major * 1000 + minor * 100 + patch)
+    
+    
+    
+@instrumentation.instrument('fbx.import_fbx_batch')
+def import_fbx_batch(file_paths: typing.Iterable[str], import_filter: FbxFilterType, per_file_scene: bool=True,
+                     max_workers: int=None,
+                     on_import: typing.Callable[[cg3dguru.datatypes.PyScene, FbxJobResult], None]=None,
+                     max_open_scenes: int=MAX_BATCH_SCENES) -> typing.List[FbxJobResult]:
+    """Import many fbx files, validating them before they reach the loader
+    
+    The files are checked with read_fbx_header() on a thread pool, so missing,
+    empty and non-fbx files fail without ever touching Cascadeur. Each valid
+    file is imported on the calling thread as soon as its header is checked,
+    while the pool keeps validating the rest, so files are imported in the
+    order their validation completes. A failing file is recorded and the
+    batch moves on to the next one.
+    
+    With per_file_scene, each file is imported into a new scene and at most
+    max_open_scenes of the scenes made by the batch are kept open: the oldest
+    one is closed before another is created. Use on_import to process (or
+    save) each scene before it's closed. For Example:
+    
+    def _save(scene, result):
+        ...
+        
+    import_fbx_batch(paths, FbxFilterType.SCENE, on_import=_save)
+    
+    Args:
+        file_paths: The fbx files to import
+        import_filter: How to import each file
+        per_file_scene: Import each file into a new scene. When False every
+        file is imported into the current scene.
+        max_workers: The number of threads validating files. Defaults to the
+        ThreadPoolExecutor default.
+        on_import: Called with the PyScene the file was imported into and its
+        FbxJobResult after each successful import. An exception it raises is
+        recorded as the error of the file.
+        max_open_scenes: The number of per file scenes kept open
+        
+    Returns:
+        A FbxJobResult per file, in the order of file_paths. Their seconds
+        cover the import and on_import, and file_info holds the validated
+        header.
+        
+    raises:
+        ValueError: If the import_filter or max_open_scenes is invalid. This
+        is checked before anything is imported.
+    """
+    if import_filter not in _IMPORT_METHOD_NAMES:
+        raise ValueError("Invalid import_filter value: {}".format(import_filter))
+    
+    if max_open_scenes < 1:
+        raise ValueError("max_open_scenes must be at least 1, got {}".format(max_open_scenes))
+    
+    file_paths = list(file_paths)
+    results = [FbxJobResult(file_path, import_filter) for file_path in file_paths]
+    
+    scene = None
+    if not per_file_scene:
+        scene = core.get_current_scene()
+        method = instrumentation.track_call(_get_import_method(current_fbx_loader(scene), import_filter))
+        
+    open_scenes = collections.deque()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(read_fbx_header, result.file_path):result for result in results}
+        for future in concurrent.futures.as_completed(futures):
+            result = futures[future]
+            try:
+                result.file_info = future.result()
+            except Exception as e:
+                result.error = e
+                continue
+            
+            start = time.perf_counter()
+            try:
+                if per_file_scene:
+                    if len(open_scenes) >= max_open_scenes:
+                        core.close_scene(open_scenes.popleft())
+                        
+                    scene = core.new_scene()
+                    open_scenes.append(scene)
+                    method = instrumentation.track_call(_get_import_method(current_fbx_loader(scene), import_filter))
+                    
+                method(result.file_path)
+                if on_import is not None:
+                    on_import(scene, result)
+            except Exception as e:
+                result.error = e
+            finally:
+                result.seconds = time.perf_counter() - start
+                
+    return results
+    
+    
+    
+def _get_import_method(loader: csc.fbx.FbxLoader, import_filter: FbxFilterType) -> typing.Callable:
+    """Returns the loader method that imports with the given filter"""
+    method_name = _IMPORT_METHOD_NAMES.get(import_filter)
+    if method_name is None:
+        raise ValueError("Invalid import_filter value: {}".format(import_filter))
+    
+    return getattr(loader, method_name)
+    
+    
+    
+def _get_export_method(loader: csc.fbx.FbxLoader, export_filter: FbxFilterType) -> typing.Callable:
+    """Returns the loader method that exports with the given filter"""
     if export_filter == FbxFilterType.SCENE:
-        method = loader.export_all_objects
+        return loader.export_all_objects
     elif export_filter == FbxFilterType.MODEL:
-        method = loader.export_model
+        return loader.export_model
     elif export_filter == FbxFilterType.SELECTED:
+        #older versions of Cascadeur name this export_scene_selected
         if hasattr(loader, 'export_scene_selected_objects'):
-            method = loader.export_scene_selected_objects
-        else:
-            method = loader.export_scene_selected
-    elif export_filter == FbxFilterType.ANIMATION:
-        method = loader.export_joints
-    else:
-        raise ValueError("Invalid export_filter value: {}".format(export_filter))
+            return loader.export_scene_selected_objects
         
-    method(file_path)
+        return loader.export_scene_selected
+    elif export_filter == FbxFilterType.ANIMATION:
+        return loader.export_joints
+    
+    raise ValueError("Invalid export_filter value: {}".format(export_filter))
 
 
 
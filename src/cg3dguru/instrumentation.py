@@ -0,0 +1,341 @@
+"""Opt-in instrumentation of the csc api calls made through cg3dguru
+
+When enabled, every csc call made through a CscWrapper (and the direct calls
+made by the scene indexes, bulk property reads/writes and FBX functions) is
+counted and timed per csc method. High-level operations, like
+PyBehaviour.__init__ or PyScene.edit, record how many api calls they caused.
+Value methods of the ids themselves, like Guid.is_null(), aren't recorded.
+
+Example:
+    from cg3dguru import instrumentation
+
+    instrumentation.enable()
+    scene.get_scene_objects(of_type='Joint')
+    instrumentation.disable()
+    instrumentation.dump_json('calls.json')
+
+When disabled, the hooks cost a single flag check.
+"""
+
+import contextlib
+import functools
+import json
+import time
+import typing
+
+
+#Checked by every hook, so keep this a plain module level bool
+ENABLED = False
+
+#Latencies are grouped into power of two microsecond buckets. Bucket i holds
+#calls that took less than 2**i microseconds.
+HISTOGRAM_BUCKETS = 32
+
+
+
+class CallStats(object):
+    """Count, latency and latency histogram of a single csc method"""
+    __slots__ = ('count', 'total', 'minimum', 'maximum', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = 0.0
+        self.buckets = [0] * HISTOGRAM_BUCKETS
+
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if self.minimum is None or seconds < self.minimum:
+            self.minimum = seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+
+        bucket = min(int(seconds * 1000000).bit_length(), HISTOGRAM_BUCKETS - 1)
+        self.buckets[bucket] += 1
+
+
+    def percentile(self, fraction: float) -> float:
+        """Estimate the latency (in seconds) below which fraction of the calls fall
+
+        The estimate is the upper bound of the histogram bucket holding the
+        percentile, clamped to the slowest call recorded.
+        """
+        if not self.count:
+            return 0.0
+
+        target = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if seen >= target:
+                return min((2 ** bucket) / 1000000, self.maximum)
+
+        return self.maximum
+
+
+    def to_dict(self) -> dict:
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else 0.0,
+            'min': self.minimum or 0.0,
+            'max': self.maximum,
+            'p50': self.percentile(0.5),
+            'p90': self.percentile(0.9),
+            'p99': self.percentile(0.99),
+            #upper bound in microseconds -> number of calls
+            'histogram': {2 ** bucket:count for bucket, count in enumerate(self.buckets) if count},
+        }
+
+
+
+class OperationStats(object):
+    """How often a high-level operation ran and the api calls it caused"""
+    __slots__ = ('count', 'total', 'api_calls', 'depth')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        #csc method -> number of calls made while the operation was running
+        self.api_calls = {}
+        #> 0 while the operation is running, higher when it's re-entered
+        self.depth = 0
+
+
+    def to_dict(self) -> dict:
+        total_calls = sum(self.api_calls.values())
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else 0.0,
+            'api_calls': total_calls,
+            'api_calls_per_operation': total_calls / self.count if self.count else 0.0,
+            'api_call_counts': dict(self.api_calls),
+        }
+
+
+
+class Recorder(object):
+    """Collects the CallStats and OperationStats while instrumentation is enabled"""
+
+    def __init__(self):
+        self.calls: typing.Dict[str, CallStats] = {}
+        self.operations: typing.Dict[str, OperationStats] = {}
+        self._active: typing.List[OperationStats] = []
+
+
+    def record_call(self, name: str, seconds: float):
+        stats = self.calls.get(name)
+        if stats is None:
+            stats = self.calls[name] = CallStats()
+
+        stats.add(seconds)
+        for operation in self._active:
+            operation.api_calls[name] = operation.api_calls.get(name, 0) + 1
+
+
+    def begin_operation(self, name: str) -> OperationStats:
+        operation = self.operations.get(name)
+        if operation is None:
+            operation = self.operations[name] = OperationStats()
+
+        operation.count += 1
+        operation.depth += 1
+        if operation.depth == 1:
+            #re-entered operations only count their calls once
+            self._active.append(operation)
+
+        return operation
+
+
+    def end_operation(self, operation: OperationStats, seconds: float):
+        operation.depth -= 1
+        if operation.depth == 0:
+            operation.total += seconds
+            self._active.remove(operation)
+
+
+    def report(self) -> dict:
+        return {
+            'total_calls': sum(stats.count for stats in self.calls.values()),
+            'calls': {name:stats.to_dict() for name, stats in sorted(self.calls.items())},
+            'operations': {name:stats.to_dict() for name, stats in sorted(self.operations.items())},
+        }
+
+
+
+_recorder = Recorder()
+
+
+
+def enable(reset: bool=True):
+    """Start recording api calls
+
+    Args:
+        reset: Discard the results of any previous recording
+    """
+    global ENABLED
+    if reset:
+        _recorder.__init__()
+
+    ENABLED = True
+
+
+
+def disable():
+    """Stop recording api calls. The results remain available"""
+    global ENABLED
+    ENABLED = False
+
+
+
+def is_enabled() -> bool:
+    return ENABLED
+
+
+
+def reset():
+    """Discard all the recorded results"""
+    _recorder.__init__()
+
+
+
+def report() -> dict:
+    """Returns the recorded results
+
+    Latencies are in seconds. The result has the keys:
+        total_calls: The number of api calls recorded
+        calls: csc method -> count, total, mean, min, max, p50, p90, p99 and
+        a histogram of microsecond bucket upper bounds -> call count.
+        operations: operation name -> count, total, mean, api_calls,
+        api_calls_per_operation and the api_call_counts per csc method.
+    """
+    return _recorder.report()
+
+
+
+def dump_json(file_path: str, indent: int=2):
+    """Write the recorded results to a json file"""
+    with open(file_path, 'w') as handle:
+        json.dump(report(), handle, indent=indent)
+
+
+
+def record_call(name: str, seconds: float):
+    """Record a single csc call made outside of the instrumented hooks"""
+    _recorder.record_call(name, seconds)
+
+
+
+def call(name: str, func: typing.Callable, *args, **kwargs):
+    """Call func and record it as a call of the csc method name"""
+    start = time.perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        _recorder.record_call(name, time.perf_counter() - start)
+
+
+
+def track_call(func: typing.Callable, name: str=None) -> typing.Callable:
+    """Returns func, recording its calls when instrumentation is enabled
+
+    Use this for csc methods called directly on unwrapped csc objects, like
+    the viewer methods bound once by bulk operations. The func is returned
+    unchanged when instrumentation is disabled.
+
+    Args:
+        func: A bound csc method
+        name: The name to record, defaults to Class.method
+    """
+    if not ENABLED:
+        return func
+
+    if name is None:
+        name = _get_call_name(func)
+
+    @functools.wraps(func)
+    def _tracked(*args, **kwargs):
+        return call(name, func, *args, **kwargs)
+
+    return _tracked
+
+
+
+def track(target):
+    """Returns target, recording its method calls when instrumentation is enabled
+
+    Use this for unwrapped csc objects, like the viewers the scene indexes
+    read from. The target is returned unchanged when instrumentation is
+    disabled.
+    """
+    if not ENABLED:
+        return target
+
+    return _TrackedObject(target)
+
+
+
+@contextlib.contextmanager
+def operation(name: str):
+    """Attribute the api calls made inside the with block to operation name"""
+    if not ENABLED:
+        yield
+        return
+
+    stats = _recorder.begin_operation(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _recorder.end_operation(stats, time.perf_counter() - start)
+
+
+
+def instrument(name: str):
+    """Decorator recording each call of the decorated function as an operation"""
+    def decorator(func):
+        @functools.wraps(func)
+        def _instrumented(*args, **kwargs):
+            if not ENABLED:
+                return func(*args, **kwargs)
+
+            stats = _recorder.begin_operation(name)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _recorder.end_operation(stats, time.perf_counter() - start)
+
+        return _instrumented
+
+    return decorator
+
+
+
+def _get_call_name(func) -> str:
+    owner = getattr(func, '__self__', None)
+    func_name = getattr(func, '__name__', repr(func))
+    if owner is None:
+        return func_name
+
+    return '{}.{}'.format(owner.__class__.__name__, func_name)
+
+
+
+class _TrackedObject(object):
+    """Records the method calls made on the object it stands in for"""
+
+    def __init__(self, target):
+        self._target = target
+
+
+    def __getattr__(self, attr):
+        value = getattr(self._target, attr)
+        if not callable(value):
+            return value
+
+        return track_call(value, '{}.{}'.format(self._target.__class__.__name__, attr))
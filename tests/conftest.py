@@ -0,0 +1,33 @@
+"""Runs the tests against the in-memory csc stand-in of the benchmarks"""
+
+import os
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from benchmarks.__main__ import import_cg3dguru
+
+#the stand-in must be installed before cg3dguru is imported
+cg3dguru = import_cg3dguru()
+
+from benchmarks import scenes
+
+
+
+@pytest.fixture
+def scene():
+    """A new current scene of 50 objects, closed after the test"""
+    py_scene = scenes.build(50)
+    yield py_scene
+    cg3dguru.close_scene(py_scene)
+
+
+
+@pytest.fixture
+def dynamic_object(scene):
+    """An object of the scene holding a Dynamic behaviour"""
+    return next(scene_object for scene_object in scene.get_scene_objects() if scene_object.has_behaviour('Dyn0'))
@@ -0,0 +1,62 @@
+"""DataProperty and SettingProperty reads and writes"""
+
+import pytest
+
+
+
+def test_data_set_get_on_frame(scene):
+    local_position = scene.get_scene_objects()[1].Transform.local_position
+    local_position.set((1.0, 2.0, 3.0), frame=2)
+    
+    assert tuple(local_position.get(2)) == (1.0, 2.0, 3.0)
+    assert list(local_position.get_frames([2, 3])[0]) == [1.0, 2.0, 3.0]
+
+
+
+def test_data_set_get_on_frame_zero(scene):
+    local_position = scene.get_scene_objects()[1].Transform.local_position
+    scene.set_current_frame(4)
+    local_position.set((4.0, 5.0, 6.0), frame=0)
+    
+    assert tuple(local_position.get(0)) == (4.0, 5.0, 6.0)
+    assert tuple(local_position.get(4)) != (4.0, 5.0, 6.0)
+
+
+
+def test_data_set_get_on_current_frame(scene):
+    local_position = scene.get_scene_objects()[1].Transform.local_position
+    scene.set_current_frame(3)
+    local_position.set((7.0, 8.0, 9.0))
+    
+    assert tuple(local_position.get()) == (7.0, 8.0, 9.0)
+    assert tuple(local_position.get(3)) == (7.0, 8.0, 9.0)
+
+
+
+def test_data_set_many_frames(scene):
+    local_position = scene.get_scene_objects()[1].Transform.local_position
+    local_position.set((1.0, 1.0, 1.0), frames={5, 6})
+    
+    assert tuple(local_position.get(5)) == (1.0, 1.0, 1.0)
+    assert tuple(local_position.get(6)) == (1.0, 1.0, 1.0)
+
+
+
+def test_static_data_set_get(scene):
+    visible = scene.get_scene_objects()[1].Basic.visible
+    visible.set(False)
+    
+    assert visible.get() is False
+
+
+
+def test_set_many_round_trip(scene):
+    numpy = pytest.importorskip('numpy')
+    local_position = scene.get_scene_objects()[3].Transform.local_position
+    values = numpy.arange(15, dtype=float).reshape(5, 3)
+    local_position.set_many(range(5), values)
+    
+    assert (local_position.get_range(0, 4) == values).all()
+    
+    with pytest.raises(ValueError):
+        local_position.set_many(range(4), values)
@@ -0,0 +1,100 @@
+"""Invalidation of the scene indexes, behaviour caches and the current scene"""
+
+import cg3dguru
+from cg3dguru.datatypes import NAME_INDEX_THRESHOLD, NameIndex
+
+from benchmarks import scenes
+
+
+
+def test_data_edits_keep_generation(scene):
+    scene_objects = scene.get_scene_objects()
+    generation = scene.generation
+    scene.select(scene_objects[:3])
+    scene.set_current_frame(2)
+    scene_objects[5].Basic.visible.set(False)
+    with scene.transaction('Data only'):
+        scene_objects[5].Transform.local_position.set((1.0, 2.0, 3.0), frame=1)
+        
+    assert scene.generation == generation
+
+
+
+def test_structural_edits_bump_generation(scene):
+    scene_objects = scene.get_scene_objects()
+    generation = scene.generation
+    scene_objects[5].name = 'Renamed'
+    assert scene.generation != generation
+    
+    generation = scene.generation
+    scene.edit('Unknown edit', lambda scene: None)
+    assert scene.generation != generation
+    
+    assert scene.get_scene_objects(names=['Renamed'])[0].unwrap() == scene_objects[5].unwrap()
+
+
+
+def test_behaviour_name_edit_invalidates(scene, dynamic_object):
+    behaviour = dynamic_object.get_behaviour_by_name('Dyn0')
+    generation = scene.generation
+    behaviour.get_property('behaviourName').set('Renamed')
+    
+    assert scene.generation != generation
+    assert dynamic_object.has_behaviour('Renamed')
+    assert behaviour.unwrap() in [found.unwrap() for found in scene.get_dynamic_behaviours('Renamed')]
+
+
+
+def test_name_index_threshold(scene):
+    names = [scene_object.name for scene_object in scene.get_scene_objects()]
+    found = scene.get_scene_objects(names=names[:NAME_INDEX_THRESHOLD - 1])
+    assert len(found) == NAME_INDEX_THRESHOLD - 1
+    assert scene._get_built_index(NameIndex) is None
+    
+    found = scene.get_scene_objects(names=names[:NAME_INDEX_THRESHOLD])
+    assert len(found) == NAME_INDEX_THRESHOLD
+    assert scene._get_built_index(NameIndex) is not None
+
+
+
+def test_added_and_deleted_behaviours_seen_inside_edit(scene):
+    scene_object = next(found for found in scene.get_scene_objects() if found.has_behaviour('Joint'))
+    seen = {}
+    
+    def _edit(scene):
+        #delete_self() flushes its owner through a new PyObject
+        scene_object.get_behaviour_by_name('Joint').delete_self()
+        seen['deleted'] = scene_object.has_behaviour('Joint')
+        scene_object.add_behaviour('Joint')
+        seen['added'] = len(scene_object.get_behaviours_by_name('Joint'))
+        
+    scene.edit('Replace Joint', _edit)
+    
+    assert seen == {'deleted': False, 'added': 1}
+    assert len(scene_object.get_behaviours_by_name('Joint')) == 1
+
+
+
+def test_dynamic_type_name_matches_query(scene):
+    queried = {found.unwrap() for found in scene.query().has_behaviour('Dynamic')}
+    owners = {found.unwrap() for found in scene.get_scene_objects() if found.has_behaviour('Dynamic')}
+    
+    assert queried and queried == owners
+
+
+
+def test_current_scene_sees_outside_edits(scene):
+    joint_count = len(scene.get_scene_objects(of_type='Joint'))
+    scene.ds.store.add_object('Added outside cg3dguru', 'Joint')
+    current_scene = cg3dguru.get_current_scene()
+    
+    assert current_scene is scene
+    assert len(current_scene.get_scene_objects(of_type='Joint')) == joint_count + 1
+
+
+
+def test_closed_scene_not_cached():
+    closed_scene = scenes.build(5)
+    cg3dguru.close_scene(closed_scene)
+    
+    assert cg3dguru.get_current_scene() is not closed_scene
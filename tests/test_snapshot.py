@@ -0,0 +1,49 @@
+"""PyScene.snapshot"""
+
+import os
+
+import pytest
+
+from benchmarks import fake_csc
+
+
+
+def test_snapshot_round_trip(scene, tmp_path):
+    numpy = pytest.importorskip('numpy')
+    local_position = scene.get_scene_objects()[1].Transform.local_position
+    local_position.set((1.0, 2.0, 3.0), frame=4)
+    file_path = str(tmp_path / 'snapshot.npz')
+    metadata = scene.snapshot(file_path, frames=range(10), chunk_size=3)
+    
+    archive = numpy.load(file_path)
+    assert archive['frames'].tolist() == list(range(10))
+    column = next(info for info in metadata['columns'] if info['data_id'] == local_position._get_raw_id().to_string())
+    assert archive[column['column']].shape == (10, 3)
+    assert archive[column['column']][4].tolist() == [1.0, 2.0, 3.0]
+
+
+
+def test_failed_snapshot_leaves_file_untouched(scene, tmp_path, monkeypatch):
+    file_path = str(tmp_path / 'snapshot.npz')
+    metadata = scene.snapshot(file_path, frames=range(10), chunk_size=3)
+    with open(file_path, 'rb') as handle:
+        written = handle.read()
+        
+    #a value that stops being numeric part way through the shot
+    bad_id = metadata['columns'][1]['data_id']
+    get_data_value = fake_csc.DataViewer.get_data_value
+    
+    def _get_data_value(self, data_id, frame=None):
+        if data_id.to_string() == bad_id and frame is not None and frame >= 5:
+            return 'not a number'
+        
+        return get_data_value(self, data_id, frame)
+    
+    monkeypatch.setattr(fake_csc.DataViewer, 'get_data_value', _get_data_value)
+    with pytest.raises(ValueError):
+        scene.snapshot(file_path, frames=range(10), chunk_size=3)
+        
+    with open(file_path, 'rb') as handle:
+        assert handle.read() == written
+        
+    assert os.listdir(str(tmp_path)) == ['snapshot.npz']